@@ -6,30 +6,38 @@ Production API service for chart data extraction.
 
 import os
 import io
+import csv
 import time
+import asyncio
 import base64
+import binascii
+import json
 import hashlib
 import logging
-from typing import Optional
+import functools
+import threading
+import multiprocessing
+from pathlib import Path
+from typing import Optional, Tuple
 from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import uuid
 
 import numpy as np
-from PIL import Image
+import orjson
+from PIL import Image, UnidentifiedImageError
 from fastapi import FastAPI, File, UploadFile, HTTPException, Header, Depends, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 
 # Rate limiting
-from collections import defaultdict
-from datetime import datetime, timedelta
+from collections import OrderedDict, deque
 
-# Import chart2csv core
-from chart2csv.core.pipeline import extract_chart
+# Import chart2csv core (the CV pipeline is loaded lazily, see load_extract_chart)
 from chart2csv.core.types import ChartType, Scale
 from chart2csv.core.llm_extraction import extract_chart_llm, llm_result_to_csv
 
@@ -51,10 +59,22 @@ EXTRACTIONS_TOTAL = Counter('chart2csv_extractions_total', 'Total extractions',
 ACTIVE_REQUESTS = Gauge('chart2csv_active_requests', 'Active requests')
 
 
+# --- Responses ---
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (C encoder, native numpy support)."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
 # --- Models ---
 
 class ExtractionResult(BaseModel):
     """Response model for chart extraction."""
+    # Instances are shared through the result cache, so they must not change
+    model_config = {"frozen": True}
+
     success: bool
     chart_type: str
     confidence: float
@@ -88,30 +108,113 @@ class APIResponse(BaseModel):
 # --- Rate Limiting ---
 
 class RateLimiter:
-    """Simple in-memory rate limiter."""
-    
-    def __init__(self, requests_per_minute: int = 10):
+    """
+    Simple in-memory sliding-window rate limiter.
+
+    Each key keeps a deque of monotonic admission timestamps; expired
+    entries are popped from the left, so admission cost is amortized O(1).
+
+    Tracked keys are held in LRU order and bounded: keys idle for longer
+    than `idle_eviction` seconds are swept, and the least recently seen
+    key is evicted once `max_tracked_keys` is exceeded. This keeps memory
+    flat when clients spray spoofed X-Forwarded-For addresses.
+    """
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(
+        self,
+        requests_per_minute: int = 10,
+        max_tracked_keys: int = 100_000,
+        idle_eviction: float = 300.0
+    ):
         self.requests_per_minute = requests_per_minute
-        self.requests = defaultdict(list)
-    
+        self.max_tracked_keys = max_tracked_keys
+        self.idle_eviction = idle_eviction
+        # key -> (admission timestamps, last seen)
+        self.requests: OrderedDict[str, tuple[deque, float]] = OrderedDict()
+        # Held for a handful of dict/deque operations; makes the limiter
+        # safe to call from worker threads as well as the event loop
+        self._lock = threading.Lock()
+
     def is_allowed(self, key: str) -> bool:
-        now = datetime.now()
-        minute_ago = now - timedelta(minutes=1)
-        
-        # Clean old requests
-        self.requests[key] = [t for t in self.requests[key] if t > minute_ago]
-        
-        if len(self.requests[key]) >= self.requests_per_minute:
-            return False
-        
-        self.requests[key].append(now)
-        return True
+        with self._lock:
+            now = time.monotonic()
+
+            entry = self.requests.get(key)
+            if entry is None:
+                window = deque()
+                self._evict(now)
+            else:
+                window = entry[0]
+                self.requests.move_to_end(key)
+
+            # Refresh last-seen on every check, including rejected ones
+            self.requests[key] = (window, now)
+
+            # Drop timestamps that fell out of the window
+            while window and now - window[0] >= self.WINDOW_SECONDS:
+                window.popleft()
+
+            if len(window) >= self.requests_per_minute:
+                return False
+
+            window.append(now)
+            return True
+
+    def _evict(self, now: float) -> None:
+        """Make room for a new key: sweep idle keys, then LRU-evict. Caller holds the lock."""
+        # Entries are in last-seen order, so idle keys sit at the front
+        while self.requests:
+            _, (_, last_seen) = next(iter(self.requests.items()))
+            if now - last_seen < self.idle_eviction:
+                break
+            self.requests.popitem(last=False)
+
+        while len(self.requests) >= self.max_tracked_keys:
+            self.requests.popitem(last=False)
 
 
 rate_limiter = RateLimiter(requests_per_minute=20)
 start_time = time.time()
 
 
+# --- Result Cache ---
+
+class ResultCache:
+    """
+    Bounded LRU of extraction results.
+
+    Keyed by image content hash plus extraction options, so repeated
+    uploads of the same chart skip the pipeline entirely.
+    """
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self.results: OrderedDict[tuple, "ExtractionResult"] = OrderedDict()
+
+    def get(self, key: tuple) -> Optional["ExtractionResult"]:
+        result = self.results.get(key)
+        if result is not None:
+            self.results.move_to_end(key)
+        return result
+
+    def put(self, key: tuple, result: "ExtractionResult") -> None:
+        self.results[key] = result
+        self.results.move_to_end(key)
+        while len(self.results) > self.maxsize:
+            self.results.popitem(last=False)
+
+
+result_cache = ResultCache(maxsize=512)
+
+# Worker threads for blocking LLM extraction and file I/O (asyncio.to_thread)
+EXTRACTION_THREADS = int(os.environ.get("EXTRACTION_THREADS", "40"))
+
+# Worker processes for the CPU-bound CV pipeline
+CV_PROCESSES = int(os.environ.get("CV_PROCESSES") or os.cpu_count() or 1)
+
+
 # --- App ---
 
 @asynccontextmanager
@@ -121,8 +224,28 @@ async def lifespan(app: FastAPI):
         "version": "1.0.0",
         "environment": os.environ.get("ENV", "production")
     })
+    # CV/LLM extraction blocks for seconds; size the default executor so
+    # concurrent requests are not queued behind the small stock pool
+    executor = ThreadPoolExecutor(
+        max_workers=EXTRACTION_THREADS,
+        thread_name_prefix="chart2csv-extract"
+    )
+    asyncio.get_running_loop().set_default_executor(executor)
+    # Tesseract subprocesses (started from the CV workers, which inherit
+    # this) are already run in parallel per tick label; keep each one
+    # single-threaded. Set here because the server owns its environment.
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    # The CV pipeline holds the GIL for most of its runtime, so it gets a
+    # process pool; spawn avoids forking a process that already runs threads
+    app.state.cv_pool = ProcessPoolExecutor(
+        max_workers=CV_PROCESSES,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_cv_worker
+    )
     yield
     logger.info("Chart2CSV API shutting down")
+    app.state.cv_pool.shutdown(wait=False, cancel_futures=True)
+    executor.shutdown(wait=False)
 
 
 app = FastAPI(
@@ -131,6 +254,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -176,6 +300,38 @@ app.add_middleware(
 
 # --- Helpers ---
 
+@functools.cache
+def load_extract_chart():
+    """Import the CV pipeline on first use; the default LLM path never needs it."""
+    from chart2csv.core.pipeline import extract_chart
+    return extract_chart
+
+
+# Enum lookups by value, built once instead of Enum.__call__ per request
+CHART_TYPES = {c.value: c for c in ChartType}
+SCALES = {s.value: s for s in Scale}
+
+
+def validate_extraction_options(chart_type: Optional[str], x_scale: str, y_scale: str) -> None:
+    """
+    Reject unknown chart type or scale values before any work is done.
+
+    Raises:
+        HTTPException: 400 if a value is not supported
+    """
+    if chart_type and chart_type not in CHART_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid chart_type: {chart_type}. Supported: {', '.join(CHART_TYPES)}."
+        )
+    for name, value in (("x_scale", x_scale), ("y_scale", y_scale)):
+        if value not in SCALES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid {name}: {value}. Supported: {', '.join(SCALES)}."
+            )
+
+
 def get_client_ip(x_forwarded_for: Optional[str] = Header(None)) -> str:
     """Extract client IP for rate limiting."""
     if x_forwarded_for:
@@ -183,24 +339,45 @@ def get_client_ip(x_forwarded_for: Optional[str] = Header(None)) -> str:
     return "unknown"
 
 
-def image_to_temp_path(image_bytes: bytes) -> str:
-    """
-    Save image bytes to temp file with security validation.
+# Upload limits
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+MAX_BASE64_LENGTH = (MAX_UPLOAD_BYTES + 2) // 3 * 4  # encoded size of MAX_UPLOAD_BYTES
 
-    Raises:
-        ValueError: If image format is invalid or dimensions too large
-    """
-    import tempfile
+# Security: Set maximum image size to prevent decompression bombs.
+# Applied to this process here and to each CV worker process by
+# _init_cv_worker, so the pipeline's own Image.open is covered too.
+MAX_IMAGE_PIXELS = 40_000_000  # 40MP, well above any real chart
+Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
 
-    # Security: Set maximum image size to prevent decompression bombs
-    MAX_IMAGE_PIXELS = 89478485  # PIL default (about 8192x10922)
+
+def _init_cv_worker() -> None:
+    """Initializer for CV pool processes (spawned, so nothing is inherited)."""
     Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
 
-    # Detect format and validate
-    img = Image.open(io.BytesIO(image_bytes))
+IMAGE_SUFFIXES = {"PNG": ".png", "JPEG": ".jpg", "WEBP": ".webp"}
+
+
+def sniff_image_format(header: bytes) -> Optional[str]:
+    """Identify PNG, JPEG or WEBP from the leading magic bytes."""
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "PNG"
+    if header.startswith(b"\xff\xd8\xff"):
+        return "JPEG"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "WEBP"
+    return None
+
+
+def validate_image(img: Image.Image) -> None:
+    """
+    Check format and dimensions of an opened (not yet decoded) image.
 
+    Raises:
+        ValueError: If image format is invalid or dimensions too large
+    """
     # Security: Validate image format
-    if img.format not in ['PNG', 'JPEG', 'WEBP']:
+    if img.format not in IMAGE_SUFFIXES:
         raise ValueError(f"Unsupported image format: {img.format}. Only PNG, JPEG, and WEBP are allowed.")
 
     # Security: Check image dimensions to prevent decompression bombs
@@ -211,74 +388,246 @@ def image_to_temp_path(image_bytes: bytes) -> str:
     if img.width > 10000 or img.height > 10000:
         raise ValueError(f"Image dimensions too large: {img.width}x{img.height}. Maximum is 10000x10000.")
 
-    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
-        img.save(f, format="PNG")
+
+def validate_image_file(path: str) -> None:
+    """
+    Validate format and dimensions of an image file from its header.
+
+    PIL does not decode pixel data until load(), so this stays cheap even
+    for large images.
+
+    Raises:
+        ValueError: If image format is invalid or dimensions too large
+    """
+    try:
+        with Image.open(path) as img:
+            validate_image(img)
+    except Image.DecompressionBombError:
+        raise ValueError(f"Image too large. Maximum is {MAX_IMAGE_PIXELS} pixels.")
+    except UnidentifiedImageError:
+        raise ValueError("Could not read image. The file may be corrupt or truncated.")
+
+
+def image_to_temp_path(image_bytes: bytes) -> str:
+    """
+    Save image bytes to a temp file named after their detected format.
+
+    PNG, JPEG and WEBP input is written as-is, with no decode/re-encode
+    round-trip. Dimensions are checked later by validate_image_file.
+
+    Raises:
+        ValueError: If image format is invalid
+    """
+    import tempfile
+
+    image_format = sniff_image_format(image_bytes[:12])
+    if image_format is None:
+        raise ValueError("Unsupported image format. Only PNG, JPEG, and WEBP are allowed.")
+
+    with tempfile.NamedTemporaryFile(suffix=IMAGE_SUFFIXES[image_format], delete=False) as f:
+        f.write(image_bytes)
         return f.name
 
 
+async def upload_to_temp_path(file: UploadFile) -> Tuple[str, str]:
+    """
+    Stream an upload to a temp file in fixed-size chunks.
+
+    Size limit, content hash, magic-byte format check and the disk write
+    all happen in a single pass over the chunks as they arrive, so the
+    upload is never fully buffered or re-encoded. Dimensions are checked
+    later by validate_image_file, and only on a result cache miss.
+
+    Returns:
+        Tuple of (temp_path, content_hash)
+
+    Raises:
+        ValueError: If the upload is too large or not a PNG/JPEG/WEBP image
+    """
+    import tempfile
+
+    digest = hashlib.blake2b(digest_size=16)
+    size = 0
+    f = None
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > MAX_UPLOAD_BYTES:
+                raise ValueError("File too large. Maximum size is 10MB.")
+            digest.update(chunk)
+
+            if f is None:
+                image_format = sniff_image_format(chunk[:12])
+                if image_format is None:
+                    raise ValueError("Unsupported image format. Only PNG, JPEG, and WEBP are allowed.")
+                f = tempfile.NamedTemporaryFile(suffix=IMAGE_SUFFIXES[image_format], delete=False)
+
+            await asyncio.to_thread(f.write, chunk)
+    except BaseException:
+        if f is not None:
+            f.close()
+            Path(f.name).unlink(missing_ok=True)
+        raise
+
+    if f is None:
+        raise ValueError("Empty upload.")
+    f.close()
+
+    return f.name, digest.hexdigest()
+
+
 def parse_csv_to_data(csv_content: str) -> list[dict]:
-    """Parse CSV string to list of dicts."""
-    lines = csv_content.strip().split("\n")
-    if len(lines) < 2:
+    """
+    Parse CSV string to list of dicts.
+
+    Columns are converted to float in bulk; a column that does not parse
+    as a whole falls back to per-cell conversion, keeping text as-is.
+    Unquoted two-column input (the usual x,y output) takes a fast path
+    that splits each row with str.partition.
+    """
+    csv_content = csv_content.strip()
+
+    if '"' not in csv_content:
+        header, _, body = csv_content.partition("\n")
+        headers = [h.strip() for h in header.split(",")]
+        if len(headers) == 2:
+            return _parse_two_column_csv(headers[0], headers[1], body)
+
+    reader = csv.reader(io.StringIO(csv_content))
+    headers = [h.strip() for h in next(reader, [])]
+    rows = [[v.strip() for v in row] for row in reader if len(row) == len(headers)]
+    if not rows:
         return []
 
-    headers = [h.strip() for h in lines[0].split(",")]
-    data = []
+    columns = []
+    for column in zip(*rows):
+        try:
+            columns.append(np.asarray(column, dtype=np.float64).tolist())
+        except ValueError:
+            columns.append([_to_float_or_str(v) for v in column])
+
+    return [dict(zip(headers, values)) for values in zip(*columns)]
 
-    for line in lines[1:]:
-        values = [v.strip() for v in line.split(",")]
-        if len(values) == len(headers):
-            row = {}
-            for i, h in enumerate(headers):
-                try:
-                    row[h] = float(values[i])
-                except ValueError:
-                    row[h] = values[i]
-            data.append(row)
 
+def _parse_two_column_csv(x_name: str, y_name: str, body: str) -> list[dict]:
+    """Parse unquoted two-column CSV rows without per-row list allocation."""
+    data = []
+    for line in body.split("\n"):
+        x, sep, y = line.partition(",")
+        if not sep or "," in y:
+            continue
+        try:
+            # float() ignores surrounding whitespace
+            data.append({x_name: float(x), y_name: float(y)})
+        except ValueError:
+            data.append({x_name: _to_float_or_str(x.strip()), y_name: _to_float_or_str(y.strip())})
     return data
 
 
+def _to_float_or_str(value: str):
+    """Convert a CSV cell to float, keeping non-numeric text."""
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def points_to_csv(points: np.ndarray) -> str:
+    """Format Nx2 points as an x,y CSV string in a single csv.writer pass."""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(("x", "y"))
+    writer.writerows(np.asarray(points, dtype=np.float64).reshape(-1, 2).tolist())
+    return buf.getvalue().rstrip("\n")
+
+
+# Results with more points than this are streamed instead of rendered whole
+STREAM_THRESHOLD_POINTS = 2000
+STREAM_BATCH_POINTS = 1000
+
+
+def extraction_response(result: ExtractionResult):
+    """Return small results as-is; stream large ones as JSON chunks."""
+    if len(result.data) <= STREAM_THRESHOLD_POINTS:
+        return result
+    return StreamingResponse(_stream_extraction_json(result), media_type="application/json")
+
+
+async def _stream_extraction_json(result: ExtractionResult):
+    """Yield an ExtractionResult as JSON, encoding data points in batches."""
+    head = orjson.dumps({
+        "success": result.success,
+        "chart_type": result.chart_type,
+        "confidence": result.confidence,
+    })
+    yield head[:-1] + b',"data":['
+
+    data = result.data
+    for i in range(0, len(data), STREAM_BATCH_POINTS):
+        batch = orjson.dumps(data[i:i + STREAM_BATCH_POINTS])[1:-1]
+        yield batch if i == 0 else b"," + batch
+
+    tail = orjson.dumps({
+        "csv": result.csv,
+        "warnings": result.warnings,
+        "processing_time_ms": result.processing_time_ms,
+    })
+    yield b"]," + tail[1:]
+
+
 async def _process_chart_extraction(
-    image_bytes: bytes,
+    temp_path: str,
     mode: str = "llm",
     chart_type: Optional[str] = None,
     x_scale: str = "linear",
     y_scale: str = "linear",
     calibration_points: Optional[dict] = None,
-    use_mistral: bool = True
+    use_mistral: bool = True,
+    image_hash: Optional[str] = None
 ) -> ExtractionResult:
     """
     Core extraction logic shared across all endpoints.
 
     Args:
-        image_bytes: Raw image bytes
+        temp_path: Temp image file, removed once extraction finishes
         mode: Extraction mode (llm, cv, auto)
         chart_type: Optional chart type override
         x_scale: X-axis scale (linear, log)
         y_scale: Y-axis scale (linear, log)
         calibration_points: Optional manual calibration data
         use_mistral: Whether to use Mistral OCR
+        image_hash: Content hash of the image; enables the result cache
 
     Returns:
         ExtractionResult with extracted data
     """
-    import asyncio
-
     start = time.time()
-    temp_path = None
+
+    cache_key = None
+    if image_hash:
+        cache_key = (
+            image_hash, mode, chart_type, x_scale, y_scale, use_mistral,
+            json.dumps(calibration_points, sort_keys=True) if calibration_points else None
+        )
 
     try:
-        # Save to temp file with validation
-        temp_path = image_to_temp_path(image_bytes)
+        cached = result_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            return cached.model_copy(update={"processing_time_ms": 0})
+
+        # Only images that reach the pipeline need their header parsed
+        await asyncio.to_thread(validate_image_file, temp_path)
+
         warnings = []
 
         # LLM extraction (default or auto mode)
         if mode in ("llm", "auto") and not calibration_points:
             try:
                 # Run LLM extraction in thread pool to avoid blocking
+                # The server's ResultCache covers repeat uploads; skip the
+                # unbounded per-image disk cache
                 llm_result, llm_conf = await asyncio.to_thread(
-                    extract_chart_llm, temp_path
+                    extract_chart_llm, temp_path, use_cache=False
                 )
 
                 if "error" not in llm_result and llm_result.get("data"):
@@ -289,7 +638,7 @@ async def _process_chart_extraction(
 
                     processing_time = int((time.time() - start) * 1000)
 
-                    return ExtractionResult(
+                    extraction = ExtractionResult(
                         success=True,
                         chart_type=chart_type_detected,
                         confidence=round(llm_conf, 3),
@@ -298,6 +647,9 @@ async def _process_chart_extraction(
                         warnings=warnings,
                         processing_time_ms=processing_time
                     )
+                    if cache_key:
+                        result_cache.put(cache_key, extraction)
+                    return extraction
                 elif mode == "llm":
                     # LLM mode only, but failed
                     raise HTTPException(
@@ -319,25 +671,27 @@ async def _process_chart_extraction(
                 warnings.append(f"[LLM_FALLBACK] LLM error: {str(e)}")
 
         # CV extraction (fallback or explicit or calibrated)
-        result = await asyncio.to_thread(
-            extract_chart,
+        cv_extraction = functools.partial(
+            load_extract_chart(),
             image_path=temp_path,
-            chart_type=ChartType(chart_type) if chart_type else None,
-            x_scale=Scale(x_scale),
-            y_scale=Scale(y_scale),
+            chart_type=CHART_TYPES[chart_type] if chart_type else None,
+            x_scale=SCALES[x_scale],
+            y_scale=SCALES[y_scale],
             calibration_points=calibration_points,
             use_mistral=use_mistral,
-            generate_overlay_image=False
+            generate_overlay_image=False,
+            use_cache=False
         )
+        cv_pool = getattr(app.state, "cv_pool", None)
+        if cv_pool is not None:
+            result = await asyncio.get_running_loop().run_in_executor(cv_pool, cv_extraction)
+        else:
+            result = await asyncio.to_thread(cv_extraction)
 
-        # Build CSV
-        csv_lines = ["x,y"]
-        for point in result.data:
-            csv_lines.append(f"{point[0]},{point[1]}")
-        csv_content = "\n".join(csv_lines)
-
-        # Parse to data
-        data = parse_csv_to_data(csv_content)
+        # Build response data straight from the points; CSV is formatted once
+        points = np.asarray(result.data, dtype=np.float64).reshape(-1, 2)
+        data = [{"x": x, "y": y} for x, y in points.tolist()]
+        csv_content = points_to_csv(points)
 
         # Collect warnings
         warnings.extend([f"[{w.code.value}] {w.message}" for w in result.warnings])
@@ -346,20 +700,25 @@ async def _process_chart_extraction(
 
         processing_time = int((time.time() - start) * 1000)
 
-        return ExtractionResult(
+        # Every field is built here from typed pipeline output, so skip
+        # pydantic validation of the (potentially large) data list
+        extraction = ExtractionResult.model_construct(
             success=True,
             chart_type=result.chart_type.value,
-            confidence=round(result.confidence.overall(), 3),
+            confidence=round(float(result.confidence.overall()), 3),
             data=data,
             csv=csv_content,
             warnings=warnings,
             processing_time_ms=processing_time
         )
+        # An LLM fallback may be transient; let the next request retry it
+        if cache_key and not any(w.startswith("[LLM_FALLBACK]") for w in warnings):
+            result_cache.put(cache_key, extraction)
+        return extraction
 
     finally:
         # Clean up temp file
-        if temp_path and os.path.exists(temp_path):
-            os.unlink(temp_path)
+        Path(temp_path).unlink(missing_ok=True)
 
 
 # --- Routes ---
@@ -457,6 +816,9 @@ async def _extract_data_impl(
             detail="Rate limit exceeded. Max 20 requests per minute."
         )
 
+    # Validate extraction options
+    validate_extraction_options(chart_type, x_scale, y_scale)
+
     # Validate file type
     if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(
@@ -465,29 +827,25 @@ async def _extract_data_impl(
         )
 
     try:
-        # Read image
-        image_bytes = await file.read()
-
-        if len(image_bytes) > 10 * 1024 * 1024:  # 10MB limit
-            raise HTTPException(
-                status_code=400,
-                detail="File too large. Maximum size is 10MB."
-            )
+        # Stream upload to a temp file
+        temp_path, image_hash = await upload_to_temp_path(file)
 
         # Process extraction using shared logic
-        return await _process_chart_extraction(
-            image_bytes=image_bytes,
+        result = await _process_chart_extraction(
+            temp_path=temp_path,
             mode=mode,
             chart_type=chart_type,
             x_scale=x_scale,
             y_scale=y_scale,
-            use_mistral=True
+            use_mistral=True,
+            image_hash=image_hash
         )
+        return extraction_response(result)
 
     except HTTPException:
         raise
     except ValueError as e:
-        # Image validation errors from image_to_temp_path
+        # Image validation errors
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Extraction failed: {str(e)}", exc_info=True)
@@ -558,28 +916,48 @@ async def _extract_base64_impl(
             detail="Rate limit exceeded. Max 20 requests per minute."
         )
 
+    # Validate extraction options
+    validate_extraction_options(chart_type, x_scale, y_scale)
+
     try:
-        # Decode base64
-        if "," in image_base64:
-            image_base64 = image_base64.split(",")[1]
+        # Strip data URI prefix if present
+        _, sep, payload = image_base64.partition(",")
+        if not sep:
+            payload = image_base64
+
+        # Reject oversized payloads before decoding them
+        if len(payload) > MAX_BASE64_LENGTH:
+            raise HTTPException(
+                status_code=400,
+                detail="Image too large. Maximum size is 10MB."
+            )
 
-        image_bytes = base64.b64decode(image_base64)
+        try:
+            image_bytes = base64.b64decode(payload, validate=True)
+        except binascii.Error:
+            raise HTTPException(status_code=400, detail="Invalid base64 image data.")
 
-        if len(image_bytes) > 10 * 1024 * 1024:
+        if len(image_bytes) > MAX_UPLOAD_BYTES:
             raise HTTPException(
                 status_code=400,
                 detail="Image too large. Maximum size is 10MB."
             )
 
+        # Save to temp file
+        temp_path = await asyncio.to_thread(image_to_temp_path, image_bytes)
+        image_hash = hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+
         # Process extraction using shared logic
-        return await _process_chart_extraction(
-            image_bytes=image_bytes,
+        result = await _process_chart_extraction(
+            temp_path=temp_path,
             mode=mode,
             chart_type=chart_type,
             x_scale=x_scale,
             y_scale=y_scale,
-            use_mistral=use_mistral
+            use_mistral=use_mistral,
+            image_hash=image_hash
         )
+        return extraction_response(result)
 
     except HTTPException:
         raise
@@ -651,13 +1029,7 @@ async def _extract_calibrated_impl(
         raise HTTPException(status_code=400, detail="Invalid file type. Please upload an image.")
 
     try:
-        image_bytes = await file.read()
-
-        if len(image_bytes) > 10 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="File too large. Maximum size is 10MB.")
-
         # Parse calibration JSON
-        import json
         calibration = None
         if calibration_json:
             try:
@@ -668,13 +1040,18 @@ async def _extract_calibrated_impl(
                     detail=f"Invalid calibration JSON: {str(e)}"
                 )
 
+        # Stream upload to a temp file
+        temp_path, image_hash = await upload_to_temp_path(file)
+
         # Process extraction with calibration
-        return await _process_chart_extraction(
-            image_bytes=image_bytes,
+        result = await _process_chart_extraction(
+            temp_path=temp_path,
             mode="cv",  # Calibration requires CV pipeline
             calibration_points=calibration,
-            use_mistral=True
+            use_mistral=True,
+            image_hash=image_hash
         )
+        return extraction_response(result)
 
     except HTTPException:
         raise
@@ -694,4 +1071,13 @@ app.include_router(v1_router)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop + httptools ship with uvicorn[standard]. Rate limiting and the
+    # result cache are per process, so extra workers multiply both.
+    uvicorn.run(
+        "api.main:app",
+        host=os.environ.get("API_HOST", "0.0.0.0"),
+        port=int(os.environ.get("API_PORT", "8000")),
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.environ.get("API_WORKERS", "1"))
+    )
@@ -8,7 +8,6 @@ __version__ = "0.1.0"
 __author__ = "Your Name"
 __license__ = "MIT"
 
-from chart2csv.core.pipeline import extract_chart
 from chart2csv.core.types import ChartResult, ChartType, Confidence, Warning
 
 __all__ = [
@@ -18,3 +17,12 @@ __all__ = [
     "Confidence",
     "Warning",
 ]
+
+
+def __getattr__(name):
+    # Import the CV pipeline (OpenCV, OCR backends) on first use only, so
+    # importing the package for its types stays cheap.
+    if name == "extract_chart":
+        from chart2csv.core.pipeline import extract_chart
+        return extract_chart
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
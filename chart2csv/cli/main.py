@@ -1,6 +1,7 @@
 import argparse
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import cv2
 
@@ -10,6 +11,11 @@ from chart2csv.core.export import export_csv, export_json, save_overlay
 from chart2csv.core.calibration import get_calibration_from_user
 
 def main():
+    # Tesseract subprocesses inherit this; tick labels are tiny and are
+    # already OCR'd in parallel, so keep each one single-threaded. This
+    # process owns its environment, so it is set here and not on import.
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
     parser = argparse.ArgumentParser(
         description="Chart2CSV - Extract data from chart images",
         formatter_class=argparse.RawDescriptionHelpFormatter
@@ -36,6 +42,8 @@ def main():
     # Batch options
     parser.add_argument("--batch", action="store_true", help="Process directory")
     parser.add_argument("--output-dir", help="Output directory for batch mode")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Files processed in parallel in batch mode (default: CPU count)")
 
     args = parser.parse_args()
 
@@ -117,8 +125,7 @@ def process_batch(args):
 
     print(f"Batch processing {len(files)} files into {output_dir}...")
 
-    for f in files:
-        print(f"  [{f.name}]", end=" ", flush=True)
+    def process_file(f):
         try:
             result = extract_chart(
                 f, 
@@ -128,9 +135,15 @@ def process_batch(args):
             )
             export_csv(result, output_dir / f.with_suffix(".csv").name)
             save_overlay(result.overlay, (output_dir / f"{f.stem}_overlay.png"))
-            print(f"✓ (conf: {result.confidence.overall():.2f})")
+            return f"✓ (conf: {result.confidence.overall():.2f})"
         except Exception as e:
-            print(f"✗ Error: {e}")
+            return f"✗ Error: {e}"
+
+    # OpenCV releases the GIL, so files are processed on a thread pool;
+    # map() keeps the report in input order
+    with ThreadPoolExecutor(max_workers=max(1, args.workers or 1)) as executor:
+        for f, status in zip(files, executor.map(process_file, files)):
+            print(f"  [{f.name}] {status}", flush=True)
 
 if __name__ == "__main__":
     main()
@@ -10,9 +10,20 @@ import numpy as np
 from typing import Tuple, Optional
 
 
+_TAN_10_DEG = np.tan(np.radians(10))
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    """Grayscale view of a BGR or single-channel image (no copy if gray)."""
+    if len(image.shape) == 3:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return image
+
+
 def detect_plot_area(
     image: np.ndarray,
-    margin: int = 5
+    margin: int = 5,
+    method: str = "fast"
 ) -> Tuple[Optional[Tuple[int, int, int, int]], float]:
     """
     Automatically detect the plot area in a chart image.
@@ -25,22 +36,63 @@ def detect_plot_area(
     Args:
         image: BGR image from cv2.imread()
         margin: Pixels to add inside detected boundaries
+        method: "fast" (dark-pixel projections) or "precise"
+            (Canny + Hough line detection)
 
     Returns:
         Tuple of (crop_box, confidence)
         crop_box: (x1, y1, x2, y2) or None if detection fails
         confidence: 0.0-1.0 detection quality estimate
     """
-    h, w = image.shape[:2]
+    gray = _to_gray(image)
 
-    # Convert to grayscale
-    if len(image.shape) == 3:
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    else:
-        gray = image.copy()
+    if method == "precise":
+        return _detect_plot_area_hough(gray, margin)
+    return _detect_plot_area_projection(gray, margin)
+
+
+def _detect_plot_area_projection(
+    gray: np.ndarray,
+    margin: int
+) -> Tuple[Optional[Tuple[int, int, int, int]], float]:
+    """
+    Find the axes as the rows/columns with the most dark pixels.
+
+    The Y-axis is searched in the left half, the X-axis in the bottom half;
+    the plot extends to the far ends of both axis lines.
+    """
+    h, w = gray.shape[:2]
+
+    dark = gray < 80
+    col_darkness = np.count_nonzero(dark, axis=0)
+    row_darkness = np.count_nonzero(dark, axis=1)
+
+    y_axis_x = int(np.argmax(col_darkness[:w // 2]))
+    x_axis_y = h // 2 + int(np.argmax(row_darkness[h // 2:]))
+
+    # Axis lines must cover a substantial part of the image
+    if col_darkness[y_axis_x] < h * 0.3 or row_darkness[x_axis_y] < w * 0.3:
+        return _fallback_crop(w, h), 0.3
+
+    top_y = int(np.argmax(dark[:, y_axis_x]))
+    right_x = w - 1 - int(np.argmax(dark[x_axis_y, ::-1]))
+
+    return _crop_from_axes(y_axis_x, right_x, top_y, x_axis_y, w, h, margin)
+
+
+def _detect_plot_area_hough(
+    gray: np.ndarray,
+    margin: int
+) -> Tuple[Optional[Tuple[int, int, int, int]], float]:
+    """
+    Find the axes with Canny edges and probabilistic Hough lines.
+    """
+    h, w = gray.shape[:2]
 
-    # Edge detection
-    edges = cv2.Canny(gray, 50, 150, apertureSize=3)
+    # Edge detection; with OpenCL available, Canny and Hough run through
+    # the Transparent API and only the line list is copied back
+    src = cv2.UMat(gray) if cv2.ocl.useOpenCL() else gray
+    edges = cv2.Canny(src, 50, 150, apertureSize=3)
 
     # Detect lines using Hough transform
     lines = cv2.HoughLinesP(
@@ -51,35 +103,49 @@ def detect_plot_area(
         minLineLength=min(w, h) // 4,
         maxLineGap=10
     )
+    if isinstance(lines, cv2.UMat):
+        lines = lines.get()
 
     if lines is None or len(lines) < 2:
         # Fallback: use image edges with margin
         return _fallback_crop(w, h), 0.3
 
-    # Separate horizontal and vertical lines
-    horizontal_lines = []
-    vertical_lines = []
+    # Separate horizontal and vertical lines (within 10 degrees)
+    segments = lines.reshape(-1, 4)
+    dx = np.abs(segments[:, 2] - segments[:, 0])
+    dy = np.abs(segments[:, 3] - segments[:, 1])
+    horizontal = dy < dx * _TAN_10_DEG
+    vertical = dx < dy * _TAN_10_DEG
 
-    for line in lines:
-        x1, y1, x2, y2 = line[0]
-        angle = np.abs(np.arctan2(y2 - y1, x2 - x1) * 180 / np.pi)
-
-        if angle < 10 or angle > 170:  # Horizontal
-            horizontal_lines.append((y1 + y2) // 2)
-        elif 80 < angle < 100:  # Vertical
-            vertical_lines.append((x1 + x2) // 2)
-
-    if not horizontal_lines or not vertical_lines:
+    if not horizontal.any() or not vertical.any():
         return _fallback_crop(w, h), 0.4
 
+    horizontal_lines = (segments[horizontal, 1] + segments[horizontal, 3]) // 2
+    vertical_lines = (segments[vertical, 0] + segments[vertical, 2]) // 2
+
     # Find axis boundaries
     # Y-axis is typically on the left
     # X-axis is typically at the bottom
-    left_x = min(vertical_lines)
-    right_x = max(vertical_lines)
-    top_y = min(horizontal_lines)
-    bottom_y = max(horizontal_lines)
-
+    left_x = int(vertical_lines.min())
+    right_x = int(vertical_lines.max())
+    top_y = int(horizontal_lines.min())
+    bottom_y = int(horizontal_lines.max())
+
+    return _crop_from_axes(left_x, right_x, top_y, bottom_y, w, h, margin)
+
+
+def _crop_from_axes(
+    left_x: int,
+    right_x: int,
+    top_y: int,
+    bottom_y: int,
+    w: int,
+    h: int,
+    margin: int
+) -> Tuple[Tuple[int, int, int, int], float]:
+    """
+    Validate detected axis bounds and shrink them by the margin.
+    """
     # Validate detected region
     width = right_x - left_x
     height = bottom_y - top_y
@@ -118,12 +184,7 @@ def detect_plot_area_contour(
         Tuple of (crop_box, confidence)
     """
     h, w = image.shape[:2]
-
-    # Convert to grayscale
-    if len(image.shape) == 3:
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    else:
-        gray = image.copy()
+    gray = _to_gray(image)
 
     # Threshold to find white/light regions (plot background)
     _, binary = cv2.threshold(gray, 240, 255, cv2.THRESH_BINARY)
@@ -174,8 +235,8 @@ def _fallback_crop(w: int, h: int) -> Tuple[int, int, int, int]:
     """
     Return default crop with 10% margin on all sides.
     """
-    margin_x = int(w * 0.1)
-    margin_y = int(h * 0.1)
+    margin_x = w // 10
+    margin_y = h // 10
     return (margin_x, margin_y, w - margin_x, h - margin_y)
 
 
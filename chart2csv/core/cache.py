@@ -1,16 +1,32 @@
 """
 OCR Cache for Chart2CSV.
 
-Provides disk-based caching of OCR results to avoid redundant API calls.
+Provides disk-based caching of OCR results to avoid redundant API calls,
+and of extracted pixel points so repeat runs skip extraction entirely.
 """
 
 import hashlib
 import json
 import os
+import threading
+import zipfile
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+import cv2
 import numpy as np
 
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 def get_cache_dir() -> Path:
     """Get cache directory, creating if needed."""
@@ -19,32 +35,70 @@ def get_cache_dir() -> Path:
     return cache_dir
 
 
-def compute_image_hash(image: np.ndarray) -> str:
-    """Compute hash of image for cache key."""
-    # Use a fast hash of the image bytes
-    return hashlib.md5(image.tobytes()).hexdigest()
+# Side of the thumbnail that cache keys are computed from
+HASH_THUMBNAIL_SIZE = 64
+
+
+def get_points_cache_dir() -> Path:
+    """Get extracted-points cache directory, creating if needed."""
+    cache_dir = Path.home() / ".cache" / "chart2csv" / "points"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def compute_image_hash(image: np.ndarray, thumbnail: bool = True) -> str:
+    """
+    Compute hash of image for cache key.
+
+    By default the key is a perceptual identity: it covers the image shape
+    plus an INTER_AREA thumbnail rather than every pixel, so visually
+    identical images of the same size share cached OCR results. Pass
+    thumbnail=False to hash every element, which works for any array
+    (e.g. raw file bytes).
+    """
+    # Key on the original shape so resized copies never collide
+    if XXHASH_AVAILABLE:
+        hasher = xxhash.xxh3_128(repr(image.shape).encode())
+    else:
+        hasher = hashlib.blake2b(repr(image.shape).encode(), digest_size=16)
+
+    if thumbnail and image.shape[0] * image.shape[1] > HASH_THUMBNAIL_SIZE * HASH_THUMBNAIL_SIZE:
+        image = cv2.resize(
+            image, (HASH_THUMBNAIL_SIZE, HASH_THUMBNAIL_SIZE), interpolation=cv2.INTER_AREA
+        )
+
+    # Hash the pixel buffer in place (no tobytes() copy)
+    hasher.update(np.ascontiguousarray(image))
+    return hasher.hexdigest()
 
 
-def get_cached_result(image: np.ndarray, backend: str = "tesseract") -> Optional[Dict[str, Any]]:
+def get_cached_result(
+    image: np.ndarray,
+    backend: str = "tesseract",
+    thumbnail: bool = True
+) -> Optional[Dict[str, Any]]:
     """
     Get cached OCR result if available.
     
     Args:
         image: Input image
         backend: OCR backend used ("tesseract" or "mistral")
+        thumbnail: Key on a thumbnail rather than every pixel (see
+            compute_image_hash)
         
     Returns:
         Cached result dict or None if not cached
     """
     cache_dir = get_cache_dir()
-    image_hash = compute_image_hash(image)
+    image_hash = compute_image_hash(image, thumbnail=thumbnail)
     cache_file = cache_dir / f"{backend}_{image_hash}.json"
     
     if cache_file.exists():
         try:
-            with open(cache_file, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            with open(cache_file, "rb") as f:
+                payload = f.read()
+            return orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
+        except (ValueError, IOError):
             return None
     return None
 
@@ -53,7 +107,8 @@ def save_to_cache(
     image: np.ndarray, 
     result: Dict[str, Any], 
     confidence: float,
-    backend: str = "tesseract"
+    backend: str = "tesseract",
+    thumbnail: bool = True
 ) -> None:
     """
     Save OCR result to cache.
@@ -63,9 +118,10 @@ def save_to_cache(
         result: OCR result dict
         confidence: OCR confidence score
         backend: OCR backend used
+        thumbnail: Must match the value passed to get_cached_result
     """
     cache_dir = get_cache_dir()
-    image_hash = compute_image_hash(image)
+    image_hash = compute_image_hash(image, thumbnail=thumbnail)
     cache_file = cache_dir / f"{backend}_{image_hash}.json"
     
     cache_data = {
@@ -74,18 +130,105 @@ def save_to_cache(
         "backend": backend
     }
     
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(cache_data, option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        payload = json.dumps(cache_data).encode()
+
+    tmp_file = _tmp_path(cache_file)
+    try:
+        # Write then rename so concurrent readers never see a partial file
+        with open(tmp_file, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_file, cache_file)
+    except IOError:
+        pass  # Silently fail if cache write fails
+
+
+def _tmp_path(cache_file: Path) -> Path:
+    """Per-process, per-thread temporary name next to a cache file."""
+    return cache_file.with_name(
+        f"{cache_file.name}.{os.getpid()}-{threading.get_ident()}.tmp"
+    )
+
+
+def _points_cache_file(
+    image: np.ndarray,
+    method: str,
+    crop_box: Optional[Tuple[int, int, int, int]]
+) -> Path:
+    # Exact pixel hash: point coordinates must come from this very image
+    image_hash = compute_image_hash(image, thumbnail=False)
+    crop = "full" if crop_box is None else "-".join(str(int(v)) for v in crop_box)
+    return get_points_cache_dir() / f"{method}_{image_hash}_{crop}.npz"
+
+
+def get_cached_points(
+    image: np.ndarray,
+    method: str,
+    crop_box: Optional[Tuple[int, int, int, int]] = None
+) -> Optional[Tuple[np.ndarray, float]]:
+    """
+    Get cached extraction output if available.
+
+    Args:
+        image: Image the points were extracted from
+        method: Extraction method / chart type
+        crop_box: Crop region used for extraction
+
+    Returns:
+        Tuple of (points, confidence) or None if not cached
+    """
+    cache_file = _points_cache_file(image, method, crop_box)
+
+    if cache_file.exists():
+        try:
+            with np.load(cache_file) as cached:
+                return cached["points"], float(cached["confidence"])
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            return None
+    return None
+
+
+def save_points(
+    image: np.ndarray,
+    points: np.ndarray,
+    confidence: float,
+    method: str,
+    crop_box: Optional[Tuple[int, int, int, int]] = None
+) -> None:
+    """
+    Save extraction output to cache.
+
+    Args:
+        image: Image the points were extracted from
+        points: Nx2 array of (x, y) pixel coordinates
+        confidence: Extraction confidence
+        method: Extraction method / chart type
+        crop_box: Crop region used for extraction
+    """
+    cache_file = _points_cache_file(image, method, crop_box)
+    tmp_file = _tmp_path(cache_file)
+
     try:
-        with open(cache_file, "w") as f:
-            json.dump(cache_data, f)
+        # Write then rename so concurrent readers never see a partial file
+        with open(tmp_file, "wb") as f:
+            np.savez(f, points=np.asarray(points, dtype=np.float64), confidence=confidence)
+        os.replace(tmp_file, cache_file)
     except IOError:
         pass  # Silently fail if cache write fails
 
 
 def clear_cache() -> int:
-    """Clear all cached OCR results. Returns number of files deleted."""
+    """Clear all cached OCR results and points. Returns number of files deleted."""
     cache_dir = get_cache_dir()
     count = 0
-    for f in cache_dir.glob("*.json"):
+    # *.pkl entries are from an earlier pickle format and are never read
+    for f in [
+        *cache_dir.glob("*.json"),
+        *cache_dir.glob("*.pkl"),
+        *get_points_cache_dir().glob("*.npz"),
+    ]:
         try:
             f.unlink()
             count += 1
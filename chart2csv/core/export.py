@@ -10,6 +10,20 @@ from typing import Dict, Any, Optional
 
 from chart2csv.core.types import ChartResult, ChartType
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# CSV column names per exportable chart type
+CSV_HEADERS = {
+    ChartType.SCATTER: "x,y",
+    ChartType.LINE: "x,y",
+    ChartType.BAR: "x,value",
+}
+
 
 def export_csv(result: ChartResult, output_path: str):
     """
@@ -22,22 +36,15 @@ def export_csv(result: ChartResult, output_path: str):
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    data = result.data
-
-    if result.chart_type in [ChartType.SCATTER, ChartType.LINE]:
-        # x,y format
-        header = "x,y\n"
-        rows = [f"{x:.6g},{y:.6g}\n" for x, y in data]
-    elif result.chart_type == ChartType.BAR:
-        # category,value or x,value
-        header = "x,value\n"
-        rows = [f"{x:.6g},{y:.6g}\n" for x, y in data]
-    else:
+    # scatter/line: x,y format; bar: category,value or x,value
+    header = CSV_HEADERS.get(result.chart_type)
+    if header is None:
         raise ValueError(f"Cannot export chart type: {result.chart_type}")
 
+    data = np.asarray(result.data, dtype=np.float64).reshape(-1, 2)
+
     with open(output_path, "w") as f:
-        f.write(header)
-        f.writelines(rows)
+        np.savetxt(f, data, fmt="%.6g", delimiter=",", header=header, comments="")
 
 
 def export_json(result: ChartResult, output_path: str):
@@ -53,8 +60,14 @@ def export_json(result: ChartResult, output_path: str):
 
     metadata = result.to_dict()
 
-    with open(output_path, "w") as f:
-        json.dump(metadata, f, indent=2)
+    if ORJSON_AVAILABLE:
+        with open(output_path, "wb") as f:
+            f.write(orjson.dumps(
+                metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+            ))
+    else:
+        with open(output_path, "w") as f:
+            json.dump(metadata, f, indent=2)
 
 
 def generate_overlay(
@@ -62,7 +75,8 @@ def generate_overlay(
     data: np.ndarray,
     crop_box: tuple[int, int, int, int],
     axes: Dict[str, int],
-    chart_type: ChartType
+    chart_type: ChartType,
+    inplace: bool = False
 ) -> np.ndarray:
     """
     Generate overlay image showing extracted data on original.
@@ -73,12 +87,13 @@ def generate_overlay(
         crop_box: Crop box (x1, y1, x2, y2)
         axes: Detected axes positions
         chart_type: Type of chart
+        inplace: Draw directly on original_image instead of a copy.
+            Only safe when the caller no longer needs the original.
 
     Returns:
         BGR image with overlay
     """
-    # Make a copy
-    overlay = original_image.copy()
+    overlay = original_image if inplace else original_image.copy()
 
     # Colors (BGR)
     COLOR_CROP = (0, 255, 0)      # Green
@@ -103,14 +118,14 @@ def generate_overlay(
 
     # 3. Draw extracted data
     if chart_type == ChartType.SCATTER:
-        for (x, y) in data:
-            cv2.circle(overlay, (int(x), int(y)), 4, COLOR_DATA, -1)
+        # A circle per point; at typical point counts this is cheaper than
+        # any whole-image mask pass
+        for x, y in np.asarray(data).reshape(-1, 2).astype(np.int32).tolist():
+            cv2.circle(overlay, (x, y), 4, COLOR_DATA, -1)
     elif chart_type == ChartType.LINE:
         if len(data) > 1:
-            for i in range(len(data) - 1):
-                p1 = (int(data[i][0]), int(data[i][1]))
-                p2 = (int(data[i+1][0]), int(data[i+1][1]))
-                cv2.line(overlay, p1, p2, COLOR_DATA, 2)
+            pts = np.asarray(data).reshape(-1, 1, 2).astype(np.int32)
+            cv2.polylines(overlay, [pts], False, COLOR_DATA, 2)
     elif chart_type == ChartType.BAR:
         for (x, y) in data:
             # Draw a marker at the top middle of the bar
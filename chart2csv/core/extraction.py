@@ -6,9 +6,15 @@ Implements multiple extraction strategies for scatter plots:
 - Blob detection with grid removal (fallback)
 """
 
+import functools
+
 import cv2
 import numpy as np
-from typing import Tuple, Optional, List
+from typing import Tuple, Optional
+
+# Bump whenever a change alters extracted points, so cached points from
+# older releases are not reused (see pipeline points cache)
+EXTRACTION_VERSION = 2
 
 
 def remove_grid_lines(binary: np.ndarray) -> np.ndarray:
@@ -29,15 +35,16 @@ def remove_grid_lines(binary: np.ndarray) -> np.ndarray:
     # Detect vertical lines
     vertical_lines = cv2.morphologyEx(binary, cv2.MORPH_OPEN, vertical_kernel, iterations=2)
 
-    # Combine lines
-    grid_mask = cv2.bitwise_or(horizontal_lines, vertical_lines)
+    # Combine lines (reusing the horizontal buffer for every later step)
+    grid_mask = cv2.bitwise_or(horizontal_lines, vertical_lines, dst=horizontal_lines)
 
     # Dilate slightly to catch edges
     dilate_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
-    grid_mask = cv2.dilate(grid_mask, dilate_kernel, iterations=1)
+    cv2.dilate(grid_mask, dilate_kernel, dst=grid_mask, iterations=1)
 
-    # Remove grid from original
-    cleaned = cv2.bitwise_and(binary, cv2.bitwise_not(grid_mask))
+    # Remove grid from original: binary - (binary & grid) == binary & ~grid
+    cv2.bitwise_and(binary, grid_mask, dst=grid_mask)
+    cleaned = cv2.subtract(binary, grid_mask, dst=grid_mask)
 
     return cleaned
 
@@ -121,37 +128,26 @@ def extract_scatter_points_color(
     color_mask = cv2.morphologyEx(color_mask, cv2.MORPH_OPEN, kernel)
     color_mask = cv2.morphologyEx(color_mask, cv2.MORPH_CLOSE, kernel)
 
-    # Find contours
-    contours, _ = cv2.findContours(color_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-    # Filter and extract centroids
-    points = []
-    areas = []
+    # Label connected blobs; stats and centroids come back in one C call
+    _, _, stats, centroids = cv2.connectedComponentsWithStats(color_mask, connectivity=8)
 
-    for contour in contours:
-        area = cv2.contourArea(contour)
+    # Drop label 0 (background)
+    areas = stats[1:, cv2.CC_STAT_AREA]
+    widths = stats[1:, cv2.CC_STAT_WIDTH]
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
 
-        # Filter by area (scatter points are typically 20-2000 pixels)
-        if area < 10 or area > 5000:
-            continue
+    # Shape from bbox stats alone: extent (fill of the bbox, ~0.79 for a
+    # disc, ~0.5 for filled triangle/diamond markers) rejects hollow blobs
+    # and diagonal strokes; aspect ratio rejects elongated shapes (text,
+    # axis-aligned lines) that fill their bbox
+    extent = areas / (widths * heights)
+    compact = np.maximum(widths, heights) <= 3 * np.minimum(widths, heights)
 
-        # Calculate circularity to filter out elongated shapes (text, lines)
-        perimeter = cv2.arcLength(contour, True)
-        if perimeter > 0:
-            circularity = 4 * np.pi * area / (perimeter * perimeter)
-            # Accept points with circularity > 0.3 (circles have ~1.0)
-            if circularity < 0.3:
-                continue
+    # Area (scatter points are typically 20-2000 pixels) and shape in one mask
+    keep = (areas >= 10) & (areas <= 5000) & (extent > 0.4) & compact
 
-        # Get centroid
-        M = cv2.moments(contour)
-        if M["m00"] > 0:
-            cx = M["m10"] / M["m00"] + offset_x
-            cy = M["m01"] / M["m00"] + offset_y
-            points.append((cx, cy))
-            areas.append(area)
-
-    points = np.array(points) if points else np.array([]).reshape(0, 2)
+    points = centroids[1:][keep] + (offset_x, offset_y)
+    areas = areas[keep]
 
     # Calculate confidence
     confidence = _calculate_confidence(points, areas)
@@ -159,6 +155,43 @@ def extract_scatter_points_color(
     return points, confidence
 
 
+@functools.lru_cache(maxsize=8)
+def _make_blob_detector(**overrides) -> "cv2.SimpleBlobDetector":
+    """
+    Build a blob detector with tuned parameters, cached per set of overrides.
+
+    Args:
+        **overrides: SimpleBlobDetector_Params attributes to change
+    """
+    params = cv2.SimpleBlobDetector_Params()
+
+    # Threshold settings
+    params.minThreshold = 10
+    params.maxThreshold = 200
+
+    # Filter by area
+    params.filterByArea = True
+    params.minArea = 15  # Increased to avoid grid remnants
+    params.maxArea = 2000  # Increased for larger points
+
+    # Filter by circularity (scatter points are usually round)
+    params.filterByCircularity = True
+    params.minCircularity = 0.5
+
+    # Filter by convexity
+    params.filterByConvexity = True
+    params.minConvexity = 0.7
+
+    # Filter by inertia (roundness)
+    params.filterByInertia = True
+    params.minInertiaRatio = 0.4
+
+    for name, value in overrides.items():
+        setattr(params, name, value)
+
+    return cv2.SimpleBlobDetector_create(params)
+
+
 def extract_scatter_points_blob(
     image: np.ndarray,
     crop_box: Optional[Tuple[int, int, int, int]] = None
@@ -175,80 +208,62 @@ def extract_scatter_points_blob(
         points: Nx2 array of (x, y) pixel coordinates
         confidence: 0.0-1.0 extraction quality estimate
     """
-    # Crop if specified
+    # Crop if specified (a view; the image is only read)
     if crop_box:
         x1, y1, x2, y2 = crop_box
-        cropped = image[y1:y2, x1:x2].copy()
+        cropped = image[y1:y2, x1:x2]
         offset_x, offset_y = x1, y1
     else:
-        cropped = image.copy()
+        cropped = image
         offset_x, offset_y = 0, 0
 
     # Convert to grayscale
     if len(cropped.shape) == 3:
         gray = cv2.cvtColor(cropped, cv2.COLOR_BGR2GRAY)
     else:
-        gray = cropped.copy()
+        gray = cropped
 
-    # Invert if needed (white background → black points)
+    # Invert if needed (white background → black points). Here and in the
+    # threshold, work in place unless the buffer is still the caller's image
     mean_brightness = np.mean(gray)
     if mean_brightness > 127:
-        binary = cv2.bitwise_not(gray)
+        binary = cv2.bitwise_not(gray, dst=None if gray is cropped else gray)
     else:
         binary = gray
 
     # Threshold to binary
-    _, binary = cv2.threshold(binary, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    _, binary = cv2.threshold(
+        binary, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU,
+        dst=None if binary is cropped else binary
+    )
 
     # Remove grid lines
     binary = remove_grid_lines(binary)
 
-    # Blob detector with tuned parameters
-    params = cv2.SimpleBlobDetector_Params()
-
-    # Threshold settings
-    params.minThreshold = 10
-    params.maxThreshold = 200
-
-    # Filter by area
-    params.filterByArea = True
-    params.minArea = 15  # Increased to avoid grid remnants
-    params.maxArea = 2000  # Increased for larger points
-
-    # Filter by circularity (scatter points are usually round)
-    params.filterByCircularity = True
-    params.minCircularity = 0.5
-
-    # Filter by convexity
-    params.filterByConvexity = True
-    params.minConvexity = 0.7
-
-    # Filter by inertia (roundness)
-    params.filterByInertia = True
-    params.minInertiaRatio = 0.4
-
-    detector = cv2.SimpleBlobDetector_create(params)
+    detector = _make_blob_detector()
     keypoints = detector.detect(binary)
 
     # Extract centroids
     if keypoints:
-        points = np.array([
-            (kp.pt[0] + offset_x, kp.pt[1] + offset_y)
-            for kp in keypoints
-        ])
-        areas = [kp.size ** 2 * np.pi / 4 for kp in keypoints]
+        points = cv2.KeyPoint_convert(keypoints).astype(np.float64) + (offset_x, offset_y)
+        sizes = np.fromiter((kp.size for kp in keypoints), dtype=np.float32, count=len(keypoints))
+        areas = sizes * sizes * np.float32(np.pi / 4)
     else:
         points = np.array([]).reshape(0, 2)
-        areas = []
+        areas = np.empty(0, dtype=np.float32)
 
     confidence = _calculate_confidence(points, areas)
 
     return points, confidence
 
 
-def _calculate_confidence(points: np.ndarray, areas: List[float]) -> float:
+def _calculate_confidence(points: np.ndarray, areas: np.ndarray) -> float:
     """
     Calculate extraction confidence based on multiple factors.
+
+    Args:
+        points: Nx2 array of (x, y) pixel coordinates
+        areas: Length-N array of blob areas in pixels
     """
     num_points = len(points)
 
@@ -265,10 +280,10 @@ def _calculate_confidence(points: np.ndarray, areas: List[float]) -> float:
 
     # Factor 2: Consistent point sizes
     if len(areas) >= 3:
-        area_std = np.std(areas)
-        area_mean = np.mean(areas)
+        areas = np.asarray(areas, dtype=np.float32)
+        area_mean = areas.mean()
         if area_mean > 0:
-            cv = area_std / area_mean  # Coefficient of variation
+            cv = areas.std() / area_mean  # Coefficient of variation
             if cv < 0.5:  # Low variation = consistent points
                 confidence += 0.2
             elif cv > 1.5:  # High variation = mixed sources
@@ -276,8 +291,7 @@ def _calculate_confidence(points: np.ndarray, areas: List[float]) -> float:
 
     # Factor 3: Point distribution (not clustered at edges)
     if num_points >= 3 and points.shape[1] == 2:
-        x_range = np.ptp(points[:, 0])
-        y_range = np.ptp(points[:, 1])
+        x_range, y_range = np.ptp(points, axis=0)
         if x_range > 50 and y_range > 50:  # Points spread out
             confidence += 0.1
 
@@ -322,13 +336,13 @@ def extract_line_points(
     if len(x_coords) == 0:
         return np.array([]), 0.1
         
-    unique_x = np.unique(x_coords)
-    points = []
-    for ux in unique_x:
-        uy = np.mean(y_coords[x_coords == ux])
-        points.append((ux + x1, uy + y1))
-        
-    points = np.array(points)
+    # Per-column mean Y in a single pass
+    sums = np.bincount(x_coords, weights=y_coords)
+    counts = np.bincount(x_coords)
+    unique_x = np.flatnonzero(counts)
+    mean_y = sums[unique_x] / counts[unique_x]
+
+    points = np.column_stack([unique_x + x1, mean_y + y1])
     
     # Confidence based on continuity
     continuity = len(unique_x) / (x2 - x1) if (x2 - x1) > 0 else 0
@@ -363,20 +377,24 @@ def extract_bar_data(
     from chart2csv.core.extraction import remove_grid_lines
     binary = remove_grid_lines(binary)
     
-    contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    
-    points = []
-    for cnt in contours:
-        bx, by, bw, bh = cv2.boundingRect(cnt)
-        
-        # Filter for bars (aspect ratio, minimum size)
-        if bh > 10 and bw > 5:
-            # Bar top center
-            points.append((bx + bw/2 + x1, by + y1))
-            
+    _, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+
+    # Drop label 0 (background)
+    lefts = stats[1:, cv2.CC_STAT_LEFT]
+    tops = stats[1:, cv2.CC_STAT_TOP]
+    widths = stats[1:, cv2.CC_STAT_WIDTH]
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+
+    # Filter for bars (aspect ratio, minimum size)
+    keep = (heights > 10) & (widths > 5)
+
+    # Bar top center
+    cx = lefts[keep] + widths[keep] / 2 + x1
+    cy = tops[keep] + y1
+
     # Sort by X
-    points.sort(key=lambda p: p[0])
-    points = np.array(points)
+    order = np.argsort(cx, kind="stable")
+    points = np.column_stack([cx[order], cy[order]]).astype(np.float64)
     
     # Confidence based on finding at least some bars
     confidence = 0.5 + 0.4 * (1.0 if len(points) > 0 else 0.0)
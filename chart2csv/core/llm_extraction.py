@@ -5,12 +5,29 @@ Direct image → JSON extraction without complex CV pipeline.
 """
 
 import os
+import asyncio
 import base64
+import csv
+import io
 import json
-import re
 from typing import Dict, Any, List, Optional, Tuple
 import cv2
 import numpy as np
+from PIL import Image
+
+from chart2csv.core.cache import get_cached_result, save_to_cache
+from chart2csv.core.mistral_ocr import (
+    BATCH_POLL_SECONDS,
+    CHART_MAX_SIDE,
+    CHART_MODEL,
+    IMAGE_ENCODINGS,
+    call_with_retry,
+    call_with_retry_async,
+    encode_image_base64,
+    find_json_object,
+    limit_image_size,
+    run_chat_batch,
+)
 
 try:
     from mistralai import Mistral
@@ -18,57 +35,14 @@ try:
 except ImportError:
     MISTRAL_AVAILABLE = False
 
+# Bump whenever the extraction prompt changes, so cached results from the
+# old prompt are not reused
+PROMPT_VERSION = 1
 
-def encode_image_base64(image: np.ndarray) -> str:
-    """Encode OpenCV image to base64 data URL."""
-    success, buffer = cv2.imencode('.png', image)
-    if not success:
-        raise ValueError("Failed to encode image to PNG")
-    return f"data:image/png;base64,{base64.b64encode(buffer).decode('utf-8')}"
-
-
-def extract_chart_llm(
-    image_path: str,
-    model: str = "mistral-ocr-latest"
-) -> Tuple[Dict[str, Any], float]:
-    """
-    Extract chart data using LLM vision in a single API call.
-    
-    Args:
-        image_path: Path to chart image
-        model: Mistral vision model to use
-        
-    Returns:
-        Tuple of (result_dict, confidence)
-        result_dict: {
-            "chart_type": str,
-            "x_label": str,
-            "y_label": str,
-            "data": [{"x": float, "y": float}, ...]
-        }
-    """
-    api_key = os.environ.get("MISTRAL_API_KEY")
-    if not api_key:
-        raise ValueError("MISTRAL_API_KEY not set")
-    
-    if not MISTRAL_AVAILABLE:
-        raise ImportError("mistralai package not installed")
-    
-    # Load and encode image
-    image = cv2.imread(image_path)
-    if image is None:
-        raise ValueError(f"Could not load image: {image_path}")
-    
-    image_b64 = encode_image_base64(image)
-    
-    # Create Mistral client
-    client = Mistral(api_key=api_key)
-    
-    # Two-pass extraction for better accuracy on dense charts
-    # Pass 1: Analyze and describe what you see
-    # Pass 2: Extract data points one by one
-    
-    prompt = """You are a precise chart data extraction AI. 
+# Two-pass extraction for better accuracy on dense charts
+# Pass 1: Analyze and describe what you see
+# Pass 2: Extract data points one by one
+_EXTRACTION_PROMPT_V1 = """You are a precise chart data extraction AI. 
 
 TASK: Extract ALL data points from this chart with maximum precision.
 
@@ -99,80 +73,513 @@ Output ONLY valid JSON:
 
 VERIFICATION: Your data array length should match point_count."""
 
+# Multi-chart variant of _EXTRACTION_PROMPT_V1. The chart count is
+# appended at the end so the shared prefix stays identical across calls.
+_MARSHALED_PROMPT_V1 = """You are a precise chart data extraction AI.
+
+TASK: The images below are separate charts, numbered from 0 in the order given. Extract ALL data points from EACH chart with maximum precision.
+
+For EACH chart:
+- Determine the chart type and read both axis ranges
+- For EACH visible marker, read its X and Y value
+- Do NOT smooth or interpolate - real data is often irregular
+- Never mix up data between charts
+
+Output ONLY valid JSON, with one entry per chart:
+{
+    "results": [
+        {
+            "id": chart number,
+            "chart_type": "line" or "scatter" or "bar",
+            "x_label": "axis label",
+            "y_label": "axis label",
+            "point_count": number of data points you counted,
+            "data": [{"x": value, "y": value}, ...]
+        },
+        ...
+    ]
+}"""
+
+# Typical latency of one chart extraction request, in seconds
+LLM_REQUEST_SECONDS = 5.0
+
+# Most charts packed into one marshaled request; latency grows
+# super-linearly with more images per prompt
+MAX_MARSHALED_IMAGES = 8
+
+
+def extract_chart_llm(
+    image_path: str,
+    model: str = "mistral-ocr-latest",
+    use_cache: bool = True
+) -> Tuple[Dict[str, Any], float]:
+    """
+    Extract chart data using LLM vision in a single API call.
+    
+    Args:
+        image_path: Path to chart image
+        model: Mistral vision model to use
+        use_cache: Reuse the result of an earlier call on the same image
+        
+    Returns:
+        Tuple of (result_dict, confidence)
+        result_dict: {
+            "chart_type": str,
+            "x_label": str,
+            "y_label": str,
+            "data": [{"x": float, "y": float}, ...]
+        }
+    """
+    raw = _read_image_bytes(image_path)
+
+    # Keyed on the exact file contents: the points come from this very image
+    cache_key = np.frombuffer(raw, dtype=np.uint8)
+    cache_backend = f"llm_{CHART_MODEL}_v{PROMPT_VERSION}"
+    if use_cache:
+        cached = get_cached_result(cache_key, backend=cache_backend, thumbnail=False)
+        if cached:
+            return cached["result"], cached["confidence"]
+
+    client = _create_client()
+    image_b64 = _chart_data_url(raw, image_path)
+
     try:
         # Direct extraction with pixtral (OCR doesn't work for charts)
-        response = client.chat.complete(
-            model="pixtral-large-latest",
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": prompt},
-                        {"type": "image_url", "image_url": image_b64}
-                    ]
-                }
-            ],
+        content = call_with_retry(
+            _stream_chart_content,
+            client,
+            model=CHART_MODEL,
+            messages=_chart_messages(image_b64),
             max_tokens=4096,
             temperature=0.0
         )
         
-        content = response.choices[0].message.content.strip()
-        
-        # Parse JSON from response (handle markdown code blocks)
-        content = content.replace("```json", "").replace("```", "").strip()
-        
-        # Try to extract JSON object
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
-        if json_match:
-            content = json_match.group()
-        
-        result = json.loads(content)
-        
-        # Validate required fields
-        if "data" not in result or not isinstance(result["data"], list):
-            return {"error": "No data extracted", "raw": content}, 0.0
-        
-        # Calculate confidence based on data quality
-        data_points = len(result.get("data", []))
-        has_labels = bool(result.get("x_label") or result.get("y_label"))
-        has_range = all(k in result for k in ["x_min", "x_max", "y_min", "y_max"])
+        result, confidence = _parse_chart_response(content)
         
-        confidence = 0.5
-        if data_points > 0:
-            confidence += 0.2
-        if data_points > 5:
-            confidence += 0.1
-        if has_labels:
-            confidence += 0.1
-        if has_range:
-            confidence += 0.1
-        
-        confidence = min(confidence, 1.0)
-        
-        return result, confidence
-        
-    except json.JSONDecodeError as e:
-        return {"error": f"JSON parse error: {e}", "raw": content}, 0.0
     except Exception as e:
         return {"error": str(e)}, 0.0
 
+    # Failed parses are not cached so a retry can do better
+    if use_cache and confidence > 0.0:
+        save_to_cache(cache_key, result, confidence, backend=cache_backend, thumbnail=False)
+
+    return result, confidence
+
+
+async def extract_chart_llm_async(
+    image_path: str,
+    client: Optional[Any] = None
+) -> Tuple[Dict[str, Any], float]:
+    """
+    Async variant of extract_chart_llm.
+
+    Args:
+        image_path: Path to chart image
+        client: Mistral client to reuse across calls (created if omitted)
+
+    Returns:
+        Same as extract_chart_llm
+    """
+    if client is None:
+        client = _create_client()
+
+    # Decoding and encoding the image is CPU work; keep it off the loop
+    loop = asyncio.get_running_loop()
+    image_b64 = await loop.run_in_executor(None, _load_image_base64, image_path)
+
+    try:
+        response = await call_with_retry_async(
+            client.chat.complete_async,
+            model=CHART_MODEL,
+            messages=_chart_messages(image_b64),
+            max_tokens=4096,
+            temperature=0.0
+        )
+
+        return _parse_chart_response(response.choices[0].message.content)
+
+    except Exception as e:
+        return {"error": str(e)}, 0.0
+
+
+async def extract_charts_llm_async(
+    image_paths: List[str],
+    concurrency: int = 8,
+    stagger: Optional[float] = None
+) -> List[Tuple[Dict[str, Any], float]]:
+    """
+    Extract data from many charts with real-time calls run concurrently.
+
+    At most `concurrency` requests are in flight at once, so per-call
+    latency is amortized across images without exceeding rate limits.
+    The first wave of requests is started `stagger` seconds apart so they
+    are spread over the request lifecycle instead of all hitting the
+    server's image-encoding phase together; later requests are already
+    spaced out by the semaphore. For large jobs where turnaround does not
+    matter, prefer extract_charts_llm_batch.
+
+    Args:
+        image_paths: Paths to chart images
+        concurrency: Maximum simultaneous API requests
+        stagger: Seconds between the first `concurrency` request starts
+            (default: typical request latency / concurrency)
+
+    Returns:
+        (result_dict, confidence) per image, in input order; unreadable
+        images yield an error result instead of raising
+    """
+    client = _create_client()
+    semaphore = asyncio.Semaphore(concurrency)
+    if stagger is None:
+        stagger = LLM_REQUEST_SECONDS / concurrency
+
+    started = 0
+
+    async def extract_one(image_path: str) -> Tuple[Dict[str, Any], float]:
+        nonlocal started
+        async with semaphore:
+            # Stagger by slot acquisition order, not input index, so the
+            # first `concurrency` requests to actually start are spread out
+            slot = started
+            started += 1
+            if slot < concurrency:
+                await asyncio.sleep(slot * stagger)
+            try:
+                return await extract_chart_llm_async(image_path, client)
+            except ValueError as e:
+                return {"error": str(e)}, 0.0
+
+    return list(await asyncio.gather(
+        *(extract_one(p) for p in image_paths)
+    ))
+
+
+def extract_charts_llm_batch(
+    image_paths: List[str],
+    poll_interval: float = BATCH_POLL_SECONDS
+) -> List[Tuple[Dict[str, Any], float]]:
+    """
+    Extract data from many charts through Mistral's Batch API.
+
+    Sends the same request as extract_chart_llm for every image, but as a
+    single batch job: cheaper and not bound by per-request latency or rate
+    limits, at the cost of turnaround time. Use extract_chart_llm for
+    interactive use.
+
+    Args:
+        image_paths: Paths to chart images
+        poll_interval: Seconds between job status checks
+
+    Returns:
+        (result_dict, confidence) per image, in input order, as returned by
+        extract_chart_llm
+    """
+    client = _create_client()
+
+    results: List[Optional[Tuple[Dict[str, Any], float]]] = [None] * len(image_paths)
+    requests = []
+    request_indices = []
+    for i, image_path in enumerate(image_paths):
+        try:
+            image_b64 = _load_image_base64(image_path)
+        except ValueError as e:
+            results[i] = {"error": str(e)}, 0.0
+            continue
+        requests.append({
+            "messages": _chart_messages(image_b64),
+            "max_tokens": 4096,
+            "temperature": 0.0
+        })
+        request_indices.append(i)
+
+    contents = run_chat_batch(client, CHART_MODEL, requests, poll_interval=poll_interval)
+    for i, content in zip(request_indices, contents):
+        if content is None:
+            results[i] = {"error": "Batch request failed"}, 0.0
+        else:
+            results[i] = _parse_chart_response(content)
+
+    return results
+
+
+def extract_charts_llm_marshaled(
+    image_paths: List[str],
+    k: int = 4
+) -> List[Tuple[Dict[str, Any], float]]:
+    """
+    Extract data from many charts, packing k images into each API call.
+
+    Amortizes the fixed per-request overhead and stretches the request
+    rate limit over k times as many charts. Best suited to small, simple
+    charts; dense charts are more accurate with one image per call.
+
+    Args:
+        image_paths: Paths to chart images
+        k: Images per request (capped at MAX_MARSHALED_IMAGES)
+
+    Returns:
+        (result_dict, confidence) per image, in input order, as returned by
+        extract_chart_llm
+    """
+    k = max(1, min(k, MAX_MARSHALED_IMAGES))
+    client = _create_client()
+
+    results: List[Optional[Tuple[Dict[str, Any], float]]] = [None] * len(image_paths)
+    images_b64 = []
+    image_indices = []
+    for i, image_path in enumerate(image_paths):
+        try:
+            images_b64.append(_load_image_base64(image_path))
+            image_indices.append(i)
+        except ValueError as e:
+            results[i] = {"error": str(e)}, 0.0
+
+    for start in range(0, len(images_b64), k):
+        group = images_b64[start:start + k]
+        indices = image_indices[start:start + k]
+        try:
+            response = call_with_retry(
+                client.chat.complete,
+                model=CHART_MODEL,
+                messages=_marshaled_messages(group),
+                max_tokens=4096 * len(group),
+                temperature=0.0
+            )
+            group_results = _parse_marshaled_response(
+                response.choices[0].message.content, len(group)
+            )
+        except Exception as e:
+            group_results = [({"error": str(e)}, 0.0)] * len(group)
+
+        for i, result in zip(indices, group_results):
+            results[i] = result
+
+    return results
+
+
+class _JsonObjectEnd:
+    """Detects, chunk by chunk, where a top-level JSON object closes."""
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, chunk: str) -> bool:
+        """Consume chunk; True if a top-level object closed within it."""
+        closed = False
+        for ch in chunk:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                # Quotes in prose around the object are not JSON strings
+                self.in_string = self.depth > 0
+            elif ch == "{":
+                self.depth += 1
+            elif ch == "}" and self.depth:
+                self.depth -= 1
+                closed = closed or self.depth == 0
+        return closed
+
+
+def _stream_chart_content(client: Any, **kwargs: Any) -> str:
+    """
+    Run a chat completion as a stream and return the reply text.
+
+    Tokens are scanned as they arrive, and the stream is closed as soon as
+    the reply holds a complete chart JSON object, so the server stops
+    generating any trailing commentary the model adds after it. The text is
+    joined once at the end rather than grown per token.
+    """
+    parts: List[str] = []
+    end = _JsonObjectEnd()
+    with client.chat.stream(**kwargs) as stream:
+        for event in stream:
+            delta = event.data.choices[0].delta.content
+            if not delta:
+                continue
+            parts.append(delta)
+            if end.feed(delta):
+                parsed = find_json_object("".join(parts))
+                if parsed is not None and "data" in parsed:
+                    break
+    return "".join(parts)
+
+
+def _read_image_bytes(image_path: str) -> bytes:
+    """Read an image file, raising ValueError if it cannot be read."""
+    try:
+        with open(image_path, "rb") as f:
+            return f.read()
+    except OSError:
+        raise ValueError(f"Could not load image: {image_path}")
+
+
+def _chart_data_url(raw: bytes, image_path: str) -> str:
+    """
+    Data URL for a chart image file's contents.
+
+    PNG, JPEG and WebP files that are already small enough are sent as-is:
+    only their header is parsed, and no decode/encode round trip is made.
+    Anything else is decoded, downscaled and sent as JPEG.
+    """
+    try:
+        with Image.open(io.BytesIO(raw)) as img:
+            fmt, size = (img.format or "").lower(), img.size
+    except (OSError, ValueError):
+        fmt, size = "", (0, 0)
+
+    if fmt in IMAGE_ENCODINGS and max(size) <= CHART_MAX_SIDE:
+        return (IMAGE_ENCODINGS[fmt][2] + base64.b64encode(raw)).decode('ascii')
+
+    image = cv2.imdecode(np.frombuffer(raw, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError(f"Could not load image: {image_path}")
+    return encode_image_base64(limit_image_size(image, CHART_MAX_SIDE), "jpeg")
+
+
+def _load_image_base64(image_path: str) -> str:
+    """Load an image file and encode it as a data URL."""
+    return _chart_data_url(_read_image_bytes(image_path), image_path)
+
+
+def _create_client() -> Any:
+    """Create a Mistral client, failing loudly if it cannot be used."""
+    api_key = os.environ.get("MISTRAL_API_KEY")
+    if not api_key:
+        raise ValueError("MISTRAL_API_KEY not set")
+    
+    if not MISTRAL_AVAILABLE:
+        raise ImportError("mistralai package not installed")
+
+    return Mistral(api_key=api_key)
+
+
+def _chart_messages(image_b64: str) -> List[Dict[str, Any]]:
+    """Chat messages asking for every data point on the chart image."""
+    return [
+        {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": _EXTRACTION_PROMPT_V1},
+                {"type": "image_url", "image_url": image_b64}
+            ]
+        }
+    ]
+
+
+def _marshaled_messages(images_b64: List[str]) -> List[Dict[str, Any]]:
+    """Chat messages asking for the data points of several charts at once."""
+    count = len(images_b64)
+    prompt = _MARSHALED_PROMPT_V1 + (
+        f"\n\nThere are {count} charts, numbered 0 to {count - 1}."
+    )
+
+    content: List[Dict[str, Any]] = [{"type": "text", "text": prompt}]
+    content.extend({"type": "image_url", "image_url": b64} for b64 in images_b64)
+    return [{"role": "user", "content": content}]
+
+
+def _parse_marshaled_response(
+    content: str,
+    count: int
+) -> List[Tuple[Dict[str, Any], float]]:
+    """Split the model's reply to a marshaled request into per-chart results."""
+    parsed, confidence = _parse_chart_response(content, required_key="results")
+    if confidence == 0.0:
+        return [(parsed, 0.0)] * count
+
+    by_id = {}
+    for entry in parsed["results"]:
+        if isinstance(entry, dict) and isinstance(entry.get("id"), int):
+            by_id[entry["id"]] = entry
+
+    results = []
+    for i in range(count):
+        entry = by_id.get(i)
+        if entry is None:
+            results.append(({"error": f"No result for chart {i}"}, 0.0))
+        else:
+            results.append(_score_chart_result(entry))
+    return results
+
+
+def _parse_chart_response(
+    content: str,
+    required_key: str = "data"
+) -> Tuple[Dict[str, Any], float]:
+    """Parse and score the model's reply to a chart extraction request."""
+    # The object may be wrapped in markdown code blocks or prose
+    result = find_json_object(content)
+    if result is None:
+        return {"error": "JSON parse error: no JSON object in response", "raw": content}, 0.0
+    
+    # Validate required fields
+    if not isinstance(result.get(required_key), list):
+        return {"error": "No data extracted", "raw": content}, 0.0
+
+    if required_key != "data":
+        return result, 1.0
+
+    return _score_chart_result(result)
+
+
+def _score_chart_result(result: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+    """Score a parsed chart result by how complete it looks."""
+    if not isinstance(result.get("data"), list):
+        return {"error": "No data extracted", "raw": json.dumps(result)}, 0.0
+
+    # Calculate confidence based on data quality
+    data_points = len(result.get("data", []))
+    has_labels = bool(result.get("x_label") or result.get("y_label"))
+    has_range = all(k in result for k in ["x_min", "x_max", "y_min", "y_max"])
+    
+    confidence = 0.5
+    if data_points > 0:
+        confidence += 0.2
+    if data_points > 5:
+        confidence += 0.1
+    if has_labels:
+        confidence += 0.1
+    if has_range:
+        confidence += 0.1
+    
+    confidence = min(confidence, 1.0)
+    
+    return result, confidence
+
 
 def llm_result_to_array(result: Dict[str, Any]) -> np.ndarray:
     """Convert LLM extraction result to Nx2 numpy array."""
     data = result.get("data", [])
     if not data:
         return np.array([]).reshape(0, 2)
-    
+
+    # Fast path: convert straight into float arrays without per-point lists
+    try:
+        xs = np.fromiter((point.get("x", 0) for point in data), dtype=np.float64, count=len(data))
+        ys = np.fromiter((point.get("y", 0) for point in data), dtype=np.float64, count=len(data))
+    except (AttributeError, TypeError, ValueError):
+        pass
+    else:
+        # fromiter turns None into NaN; let the slow path drop those points
+        if not (np.isnan(xs).any() or np.isnan(ys).any()):
+            return np.column_stack((xs, ys))
+
+    # Some points are malformed: convert point by point, dropping bad ones
     points = []
     for point in data:
         try:
-            x = float(point.get("x", 0))
-            y = float(point.get("y", 0))
-            points.append([x, y])
-        except (TypeError, ValueError):
+            points.append((float(point.get("x", 0)), float(point.get("y", 0))))
+        except (AttributeError, TypeError, ValueError):
             continue
-    
-    return np.array(points) if points else np.array([]).reshape(0, 2)
+
+    return np.array(points, dtype=np.float64).reshape(-1, 2)
 
 
 def llm_result_to_csv(result: Dict[str, Any]) -> str:
@@ -182,14 +589,15 @@ def llm_result_to_csv(result: Dict[str, Any]) -> str:
     x_label = result.get("x_label", "x") or "x"
     y_label = result.get("y_label", "y") or "y"
     
-    lines = [f"{x_label},{y_label}"]
-    
-    for point in data:
-        try:
-            x = point.get("x", "")
-            y = point.get("y", "")
-            lines.append(f"{x},{y}")
-        except:
-            continue
+    # csv.writer formats rows in C and quotes labels containing commas
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow((x_label, y_label))
+    writer.writerows(
+        (point.get("x", ""), point.get("y", ""))
+        for point in data
+        if isinstance(point, dict)
+    )
     
-    return "\n".join(lines)
+    # No trailing newline after the last row
+    return buf.getvalue()[:-1]
@@ -5,9 +5,13 @@ This module handles interaction with Mistral's OCR API.
 """
 
 import os
+import asyncio
 import base64
+import json
+import random
 import re
-from typing import List, Dict, Any, Optional, Tuple
+import time
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Tuple, TypeVar
 import numpy as np
 import cv2
 
@@ -17,6 +21,19 @@ try:
 except ImportError:
     MISTRAL_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    # Transport used by mistralai; its network errors are not OSErrors
+    import httpx
+    _NETWORK_ERRORS: Tuple[type, ...] = (ConnectionError, TimeoutError, httpx.TransportError)
+except ImportError:
+    _NETWORK_ERRORS = (ConnectionError, TimeoutError)
+
 def get_mistral_client() -> Optional[Any]:
     """Get Mistral client if API key is present."""
     api_key = os.environ.get("MISTRAL_API_KEY")
@@ -28,12 +45,236 @@ def get_mistral_client() -> Optional[Any]:
 
     return Mistral(api_key=api_key)
 
-def encode_image_base64(image: np.ndarray) -> str:
-    """Encode OpenCV image to base64 string."""
-    success, buffer = cv2.imencode('.png', image)
+# Vision model reading numbers off axis strips
+AXES_MODEL = "pixtral-12b-2409"
+
+# Vision model used for direct chart extraction
+CHART_MODEL = "pixtral-large-latest"
+
+# Longest side of chart images sent to the vision model, in pixels
+CHART_MAX_SIDE = 1536
+
+# Seconds between Batch API job status checks
+BATCH_POLL_SECONDS = 10.0
+
+# Longest side of axis strips sent to the vision model, in pixels
+AXIS_STRIP_MAX_SIDE = 768
+
+# Regex for numbers (integers, floats, scientific notation)
+# Avoid picking up things that look like dates or indices if possible
+# But for axis labels, they are usually just numbers.
+NUMBER_RE = re.compile(r'[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?')
+
+# Retry policy for transient API failures: attempts in total, and the
+# exponential backoff bounds in seconds
+RETRY_ATTEMPTS = 3
+RETRY_INITIAL_SECONDS = 1.0
+RETRY_MAX_SECONDS = 30.0
+
+T = TypeVar("T")
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Whether an API call that raised error is worth retrying.
+
+    Network failures, timeouts, rate limiting (429) and server errors (5xx)
+    are transient; other client errors (4xx) would fail again.
+    """
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return isinstance(error, _NETWORK_ERRORS)
+
+
+def _retry_delay(attempt: int) -> float:
+    """Backoff before retry number attempt (0-based), with jitter."""
+    delay = RETRY_INITIAL_SECONDS * 2 ** attempt + random.uniform(0, RETRY_INITIAL_SECONDS)
+    return min(delay, RETRY_MAX_SECONDS)
+
+
+def call_with_retry(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Call func, retrying transient API errors with exponential backoff."""
+    for attempt in range(RETRY_ATTEMPTS - 1):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if not is_transient_error(e):
+                raise
+            time.sleep(_retry_delay(attempt))
+    return func(*args, **kwargs)
+
+
+async def call_with_retry_async(
+    func: Callable[..., Awaitable[T]],
+    *args: Any,
+    **kwargs: Any
+) -> T:
+    """Async variant of call_with_retry."""
+    for attempt in range(RETRY_ATTEMPTS - 1):
+        try:
+            return await func(*args, **kwargs)
+        except Exception as e:
+            if not is_transient_error(e):
+                raise
+            await asyncio.sleep(_retry_delay(attempt))
+    return await func(*args, **kwargs)
+
+
+def run_chat_batch(
+    client: Any,
+    model: str,
+    requests: List[Dict[str, Any]],
+    poll_interval: float = BATCH_POLL_SECONDS
+) -> List[Optional[str]]:
+    """
+    Run chat completion requests through Mistral's Batch API.
+
+    Uploads the requests as a JSONL file, creates a batch job, polls until
+    it finishes and downloads the output. Batch jobs are cheaper than
+    real-time calls and not rate limited per request, but may take a
+    long time to complete.
+
+    Args:
+        client: Mistral client
+        model: Model every request runs on
+        requests: Chat completion bodies ({"messages": [...], ...})
+        poll_interval: Seconds between job status checks
+
+    Returns:
+        Message content per request, in input order; None for requests
+        that failed
+    """
+    if not requests:
+        return []
+
+    # Serialize straight to bytes and join once: bodies carry base64
+    # images, so the payload can be many megabytes
+    content = b"\n".join(
+        _json_dumps({"custom_id": str(i), "body": body})
+        for i, body in enumerate(requests)
+    )
+    batch_file = client.files.upload(
+        file={"file_name": "chart2csv_batch.jsonl", "content": content},
+        purpose="batch"
+    )
+    job = client.batch.jobs.create(
+        input_files=[batch_file.id],
+        model=model,
+        endpoint="/v1/chat/completions"
+    )
+
+    while job.status in ("QUEUED", "RUNNING"):
+        time.sleep(poll_interval)
+        job = client.batch.jobs.get(job_id=job.id)
+
+    contents: List[Optional[str]] = [None] * len(requests)
+    if not job.output_file:
+        print(f"Mistral batch job {job.id} finished with status {job.status}")
+        return contents
+
+    output = client.files.download(file_id=job.output_file)
+    for line in output.iter_lines():
+        if not line:
+            continue
+        record = _json_loads(line)
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            continue
+        contents[int(record["custom_id"])] = (
+            response["body"]["choices"][0]["message"]["content"]
+        )
+
+    return contents
+
+
+# Image payload formats: (cv2 extension, encode params, data URL prefix).
+# JPEG at Q90 suits whole charts; lossless WebP (quality > 100) keeps thin
+# tick-label glyphs exact and is several times smaller than PNG.
+IMAGE_ENCODINGS = {
+    "png": (".png", [], b"data:image/png;base64,"),
+    "jpeg": (".jpg", [cv2.IMWRITE_JPEG_QUALITY, 90], b"data:image/jpeg;base64,"),
+    "webp": (".webp", [cv2.IMWRITE_WEBP_QUALITY, 101], b"data:image/webp;base64,"),
+}
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _json_loads(data: Any) -> Any:
+    """Parse a JSON document (str or bytes), with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize obj to compact JSON bytes, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def find_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Find the JSON object in a model reply that may wrap it in prose or
+    markdown code fences.
+
+    Decodes from each "{" in one left-to-right pass, skipping over objects
+    once decoded, so nested braces, braces inside strings and several
+    objects in one reply are all handled. Returns the largest top-level
+    object, or None if there is none.
+    """
+    # Fast path: a single object, possibly fenced, as the prompts ask for.
+    # If the outermost braces parse, no larger top-level object can exist.
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        try:
+            obj = _json_loads(text[start:end + 1])
+        except ValueError:
+            pass
+        else:
+            if isinstance(obj, dict):
+                return obj
+
+    best = None
+    best_size = 0
+    idx = text.find("{")
+    while idx != -1:
+        try:
+            obj, end = _JSON_DECODER.raw_decode(text, idx)
+        except json.JSONDecodeError:
+            idx = text.find("{", idx + 1)
+            continue
+        if isinstance(obj, dict) and end - idx > best_size:
+            best, best_size = obj, end - idx
+        idx = text.find("{", end)
+    return best
+
+
+def limit_image_size(image: np.ndarray, max_side: int) -> np.ndarray:
+    """
+    Downscale image so its longest side is at most max_side pixels.
+
+    Vision models resample images to a fixed token budget, so anything
+    larger only costs upload and server-side decode time.
+    """
+    h, w = image.shape[:2]
+    scale = max_side / max(h, w)
+    if scale >= 1.0:
+        return image
+    return cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+
+def encode_image_base64(image: np.ndarray, fmt: str = "png") -> str:
+    """Encode OpenCV image to base64 data URL in one of IMAGE_ENCODINGS."""
+    ext, params, prefix = IMAGE_ENCODINGS[fmt]
+    success, buffer = cv2.imencode(ext, image, params)
     if not success:
-        raise ValueError("Failed to encode image to PNG")
-    return f"data:image/png;base64,{base64.b64encode(buffer).decode('utf-8')}"
+        raise ValueError(f"Failed to encode image to {fmt.upper()}")
+    # Base64 output is pure ASCII: encode straight from the cv2 buffer and
+    # decode once, with the prefix already in bytes
+    return (prefix + base64.b64encode(buffer)).decode('ascii')
 
 def extract_numbers_from_mistral(image: np.ndarray) -> List[float]:
     """
@@ -56,7 +297,8 @@ def extract_numbers_from_mistral(image: np.ndarray) -> List[float]:
     base64_image = encode_image_base64(image)
 
     try:
-        ocr_response = client.ocr.process(
+        ocr_response = call_with_retry(
+            client.ocr.process,
             model="mistral-ocr-latest",
             document={
                 "type": "image_url",
@@ -85,11 +327,7 @@ def parse_numbers_from_text(text: str) -> List[float]:
     """
     Parse all numbers from a text string.
     """
-    # Regex for numbers (integers, floats, scientific notation)
-    # Avoid picking up things that look like dates or indices if possible
-    # But for axis labels, they are usually just numbers.
-    pattern = r'[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?'
-    matches = re.findall(pattern, text)
+    matches = NUMBER_RE.findall(text)
 
     values = []
     for match in matches:
@@ -139,48 +377,16 @@ class MistralOCRBackend:
             return [], []
         
         try:
-            x_base64 = encode_image_base64(x_strip)
-            y_base64 = encode_image_base64(y_strip)
-            
             # Use chat completions with multiple images for batch processing
-            response = self.client.chat.complete(
-                model="pixtral-12b-2409",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": """Extract all numbers from these two chart axis images.
-                                
-Image 1 is the X-axis (horizontal). Read numbers from LEFT to RIGHT.
-Image 2 is the Y-axis (vertical). Read numbers from BOTTOM to TOP (as chart axes normally work).
-
-Return JSON format only, with numbers in the order you read them:
-{"x": [left to right numbers], "y": [bottom to top numbers]}
-
-Example for a chart with X: 0,10,20,30 and Y: 0,25,50,75,100:
-{"x": [0, 10, 20, 30], "y": [0, 25, 50, 75, 100]}"""
-                            },
-                            {"type": "image_url", "image_url": x_base64},
-                            {"type": "image_url", "image_url": y_base64}
-                        ]
-                    }
-                ],
+            response = call_with_retry(
+                self.client.chat.complete,
+                model=AXES_MODEL,
+                messages=_axes_messages(x_strip, y_strip),
                 max_tokens=1024
             )
             
             content = response.choices[0].message.content.strip()
-            # Parse JSON response
-            import json
-            # Clean markdown if present
-            content = content.replace("```json", "").replace("```", "").strip()
-            data = json.loads(content)
-            
-            x_values = [float(v) for v in data.get("x", [])]
-            y_values = [float(v) for v in data.get("y", [])]
-            
-            return x_values, y_values
+            return _parse_axes_response(content)
             
         except Exception as e:
             print(f"Batch Mistral OCR failed: {e}")
@@ -188,3 +394,191 @@ Example for a chart with X: 0,10,20,30 and Y: 0,25,50,75,100:
             x_values = extract_numbers_from_mistral(x_strip)
             y_values = extract_numbers_from_mistral(y_strip)
             return x_values, y_values
+
+    def process_chart_plus_axes(
+        self,
+        chart_image: np.ndarray,
+        x_strip: np.ndarray,
+        y_strip: np.ndarray
+    ) -> Tuple[Dict[str, Any], List[float], List[float]]:
+        """
+        Extract chart data and both axes' tick values in a single API call.
+
+        Sends the chart and its two axis strips as three images in one
+        chat request, replacing separate chart and axes round trips.
+
+        Args:
+            chart_image: Whole chart image
+            x_strip: Image strip for X-axis labels
+            y_strip: Image strip for Y-axis labels
+
+        Returns:
+            Tuple of (chart_result, x_values, y_values); chart_result has
+            the same fields as extract_chart_llm's result, or "error" if
+            the chart could not be read
+        """
+        if not self.is_available():
+            return {"error": "Mistral client not available"}, [], []
+
+        try:
+            response = call_with_retry(
+                self.client.chat.complete,
+                model=CHART_MODEL,
+                messages=_chart_axes_messages(chart_image, x_strip, y_strip),
+                max_tokens=4096,
+                temperature=0.0
+            )
+            return _parse_chart_axes_response(response.choices[0].message.content)
+
+        except Exception as e:
+            print(f"Combined Mistral chart + axes request failed: {e}")
+            # Axis values are still worth having from their own request
+            x_values, y_values = self.process_both_axes(x_strip, y_strip)
+            return {"error": str(e)}, x_values, y_values
+
+    def process_axes_batch(
+        self,
+        strips: List[Tuple[np.ndarray, np.ndarray]],
+        poll_interval: float = BATCH_POLL_SECONDS
+    ) -> List[Tuple[List[float], List[float]]]:
+        """
+        Process (x_strip, y_strip) pairs of many charts via the Batch API.
+
+        Same request per chart as process_both_axes, but submitted as one
+        batch job for bulk runs where turnaround time does not matter.
+
+        Args:
+            strips: (x_strip, y_strip) pair per chart
+            poll_interval: Seconds between job status checks
+
+        Returns:
+            (x_values, y_values) per chart, in input order; empty lists for
+            charts whose request failed
+        """
+        if not self.is_available():
+            return [([], []) for _ in strips]
+
+        contents = run_chat_batch(
+            self.client,
+            AXES_MODEL,
+            [
+                {"messages": _axes_messages(x_strip, y_strip), "max_tokens": 1024}
+                for x_strip, y_strip in strips
+            ],
+            poll_interval=poll_interval
+        )
+
+        results = []
+        for content in contents:
+            try:
+                results.append(_parse_axes_response(content.strip()))
+            except (AttributeError, ValueError, TypeError):
+                results.append(([], []))
+        return results
+
+
+_AXES_PROMPT = """Extract all numbers from these two chart axis images.
+                                
+Image 1 is the X-axis (horizontal). Read numbers from LEFT to RIGHT.
+Image 2 is the Y-axis (vertical). Read numbers from BOTTOM to TOP (as chart axes normally work).
+
+Return JSON format only, with numbers in the order you read them:
+{"x": [left to right numbers], "y": [bottom to top numbers]}
+
+Example for a chart with X: 0,10,20,30 and Y: 0,25,50,75,100:
+{"x": [0, 10, 20, 30], "y": [0, 25, 50, 75, 100]}"""
+
+
+_CHART_AXES_PROMPT = """You are a precise chart data extraction AI.
+
+Image 1 is a whole chart. Image 2 is its X-axis label strip. Image 3 is its Y-axis label strip.
+
+From image 1, extract ALL data points with maximum precision:
+- For EACH visible marker, read its X and Y value
+- Do NOT smooth or interpolate - real data is often irregular
+
+From image 2, read the tick label numbers from LEFT to RIGHT.
+From image 3, read the tick label numbers from BOTTOM to TOP.
+
+Output ONLY valid JSON:
+{
+    "chart": {
+        "chart_type": "line" or "scatter" or "bar",
+        "x_label": "axis label",
+        "y_label": "axis label",
+        "point_count": number of data points you counted,
+        "data": [{"x": value, "y": value}, ...]
+    },
+    "x_axis": [left to right numbers],
+    "y_axis": [bottom to top numbers]
+}"""
+
+
+def _encode_axis_strip(strip: np.ndarray) -> str:
+    """Encode an axis strip for the vision model."""
+    return encode_image_base64(limit_image_size(strip, AXIS_STRIP_MAX_SIDE), "webp")
+
+
+def _axes_messages(x_strip: np.ndarray, y_strip: np.ndarray) -> List[Dict[str, Any]]:
+    """Chat messages asking for the numbers on both axis strips."""
+    return [
+        {
+            "role": "user",
+            "content": [
+                {
+                    "type": "text",
+                    "text": _AXES_PROMPT
+                },
+                {"type": "image_url", "image_url": _encode_axis_strip(x_strip)},
+                {"type": "image_url", "image_url": _encode_axis_strip(y_strip)}
+            ]
+        }
+    ]
+
+
+def _chart_axes_messages(
+    chart_image: np.ndarray,
+    x_strip: np.ndarray,
+    y_strip: np.ndarray
+) -> List[Dict[str, Any]]:
+    """Chat messages asking for chart data and both axes' numbers at once."""
+    chart_b64 = encode_image_base64(limit_image_size(chart_image, CHART_MAX_SIDE), "jpeg")
+    return [
+        {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": _CHART_AXES_PROMPT},
+                {"type": "image_url", "image_url": chart_b64},
+                {"type": "image_url", "image_url": _encode_axis_strip(x_strip)},
+                {"type": "image_url", "image_url": _encode_axis_strip(y_strip)}
+            ]
+        }
+    ]
+
+
+def _parse_chart_axes_response(content: str) -> Tuple[Dict[str, Any], List[float], List[float]]:
+    """Split the reply to a chart + axes request into its three parts."""
+    data = find_json_object(content)
+    if data is None:
+        raise ValueError("No JSON object in response")
+
+    chart = data.get("chart")
+    if not isinstance(chart, dict) or not isinstance(chart.get("data"), list):
+        chart = {"error": "No data extracted", "raw": content}
+
+    x_values = [float(v) for v in data.get("x_axis", [])]
+    y_values = [float(v) for v in data.get("y_axis", [])]
+
+    return chart, x_values, y_values
+
+
+def _parse_axes_response(content: str) -> Tuple[List[float], List[float]]:
+    """Parse the {"x": [...], "y": [...]} reply to an axes request."""
+    data = find_json_object(content)
+    if data is None:
+        raise ValueError("No JSON object in response")
+
+    x_values = [float(v) for v in data.get("x", [])]
+    y_values = [float(v) for v in data.get("y", [])]
+
+    return x_values, y_values
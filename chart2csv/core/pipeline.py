@@ -5,6 +5,7 @@ This is the entry point for chart data extraction.
 """
 
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Union, Optional, Dict, Any
 import numpy as np
@@ -23,7 +24,9 @@ from chart2csv.core.detection import detect_axes, detect_ticks
 from chart2csv.core.ocr import extract_tick_labels
 from chart2csv.core.transform import build_transform, apply_transform
 from chart2csv.core.export import generate_overlay
+from chart2csv.core.cache import get_cached_points, save_points
 from chart2csv.core.extraction import (
+    EXTRACTION_VERSION,
     extract_scatter_points,
     extract_line_points,
     extract_bar_data
@@ -129,16 +132,52 @@ def extract_chart(
                 "Use --x-axis y=PX --y-axis x=PX"
             ))
 
-    # Step 4: Detect and OCR ticks
+    # Step 4: Detect and OCR ticks. OCR waits on Tesseract or the Mistral
+    # API and shares no data with point extraction, so it runs in the
+    # background while steps 6-7 proceed.
     ticks = None
+    ocr_future = None
     if calibration_points:
         ocr_conf = 1.0
     else:
-        ticks, ocr_conf = extract_tick_labels(
+        ocr_pool = ThreadPoolExecutor(max_workers=1)
+        ocr_future = ocr_pool.submit(
+            extract_tick_labels,
             processed, axes, 
             use_mistral=use_mistral,
             use_cache=use_cache
         )
+        ocr_pool.shutdown(wait=False)
+
+    # Step 6: Detect chart type (if not manual)
+    if chart_type is None or chart_type == ChartType.UNKNOWN:
+        chart_type = detect_chart_type(cropped)
+
+    # Step 7: Extract data based on chart type (or reuse a previous run's)
+    # Keyed on the extraction version too: upgrades must not serve old points
+    points_key = f"{chart_type.value}_v{EXTRACTION_VERSION}"
+    cached_points = get_cached_points(image, points_key, crop_box) if use_cache else None
+    if cached_points is not None:
+        points_px, extraction_conf = cached_points
+    else:
+        if chart_type == ChartType.SCATTER:
+            points_px, extraction_conf = extract_scatter_points(image, crop_box)
+        elif chart_type == ChartType.LINE:
+            points_px, extraction_conf = extract_line_points(image, crop_box)
+        elif chart_type == ChartType.BAR:
+            points_px, extraction_conf = extract_bar_data(image, crop_box)
+        else:
+            # Fallback to scatter
+            points_px, extraction_conf = extract_scatter_points(image, crop_box)
+
+    # Ensure 2D array (N, 2) even if empty
+    points_px = np.array(points_px).reshape(-1, 2)
+
+    if use_cache and cached_points is None:
+        save_points(image, points_px, extraction_conf, points_key, crop_box)
+
+    if ocr_future is not None:
+        ticks, ocr_conf = ocr_future.result()
         if ocr_conf < 0.4:
             warnings_list.append((
                 WarningCode.OCR_FAILED,
@@ -174,29 +213,15 @@ def extract_chart(
         }
         fit_error = 1.0
 
-    # Step 6: Detect chart type (if not manual)
-    if chart_type is None or chart_type == ChartType.UNKNOWN:
-        chart_type = detect_chart_type(cropped)
-
-    # Step 7: Extract data based on chart type
-    if chart_type == ChartType.SCATTER:
-        points_px, extraction_conf = extract_scatter_points(image, crop_box)
-    elif chart_type == ChartType.LINE:
-        points_px, extraction_conf = extract_line_points(image, crop_box)
-    elif chart_type == ChartType.BAR:
-        points_px, extraction_conf = extract_bar_data(image, crop_box)
-    else:
-        # Fallback to scatter
-        points_px, extraction_conf = extract_scatter_points(image, crop_box)
-
-    # Ensure 2D array (N, 2) even if empty
-    points_px = np.array(points_px).reshape(-1, 2)
     data = apply_transform(points_px, transform)
 
     # Step 8: Generate overlay (if requested)
     overlay_img = None
     if generate_overlay_image:
-        overlay_img = generate_overlay(image, points_px, crop_box, axes, chart_type)
+        # The loaded image is not used past this point, so draw on it directly
+        overlay_img = generate_overlay(
+            image, points_px, crop_box, axes, chart_type, inplace=True
+        )
 
     # Build result
     confidence = Confidence(
@@ -4,12 +4,31 @@ Image preprocessing for Chart2CSV.
 Handles image normalization, enhancement, and plot area detection.
 """
 
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import cv2
 import numpy as np
-from typing import Tuple
+from typing import Optional, Tuple
+
+# Images above this many pixels are denoised in parallel stripes
+PARALLEL_MIN_PIXELS = 500_000
+
+# CLAHE objects keep internal buffers, so each thread gets its own instance
+_clahe_local = threading.local()
+
 
+def _get_clahe() -> "cv2.CLAHE":
+    """Return this thread's CLAHE filter, creating it on first use."""
+    clahe = getattr(_clahe_local, "clahe", None)
+    if clahe is None:
+        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        _clahe_local.clahe = clahe
+    return clahe
 
-def preprocess_image(image: np.ndarray) -> np.ndarray:
+
+def preprocess_image(image: np.ndarray, assume_clean_chart: bool = True) -> np.ndarray:
     """
     Preprocess chart image for better detection and OCR.
 
@@ -17,13 +36,16 @@ def preprocess_image(image: np.ndarray) -> np.ndarray:
     1. Resize to max 1200px (long side) for performance
     2. Convert to grayscale
     3. Enhance contrast (CLAHE)
-    4. Denoise (bilateral filter)
+    4. Denoise (3x3 median, or bilateral filter for noisy scans)
 
     Args:
         image: Input BGR image from cv2.imread()
+        assume_clean_chart: Rendered charts are flat backgrounds with sharp
+            lines, where a median filter is enough. Set to False for photos
+            or scans to use the slower edge-preserving bilateral filter.
 
     Returns:
-        Preprocessed grayscale image
+        Preprocessed grayscale image (a new array; the input is not modified)
     """
     # Step 1: Resize if too large
     h, w = image.shape[:2]
@@ -33,24 +55,69 @@ def preprocess_image(image: np.ndarray) -> np.ndarray:
         scale = 1200 / max_side
         new_w = int(w * scale)
         new_h = int(h * scale)
-        image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_AREA)
+        # Halve with pyrDown (blur + decimate) while more than 2x too large,
+        # so the final bilinear step doesn't skip over thin lines
+        while max(image.shape[:2]) >= 2 * 1200:
+            image = cv2.pyrDown(image)
+        image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    # With OpenCL available, steps 2-4 run on the device through the
+    # Transparent API and only the final image is copied back
+    use_opencl = cv2.ocl.useOpenCL()
+    is_color = len(image.shape) == 3
 
     # Step 2: Convert to grayscale
-    if len(image.shape) == 3:
+    if use_opencl:
+        image = cv2.UMat(image)
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if is_color else image
+    elif is_color:
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     else:
-        gray = image.copy()
+        # CLAHE writes to a new buffer, so the input is never modified
+        gray = image
 
     # Step 3: Contrast enhancement with CLAHE
-    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-    enhanced = clahe.apply(gray)
+    enhanced = _get_clahe().apply(gray)
 
     # Step 4: Denoise
-    denoised = cv2.bilateralFilter(enhanced, d=5, sigmaColor=50, sigmaSpace=50)
+    if assume_clean_chart:
+        denoised = cv2.medianBlur(enhanced, 3)
+    else:
+        if not use_opencl and enhanced.size > PARALLEL_MIN_PIXELS:
+            denoised = _parallel_bilateral(enhanced, d=5)
+        else:
+            denoised = cv2.bilateralFilter(enhanced, d=5, sigmaColor=50, sigmaSpace=50)
 
+    if use_opencl:
+        denoised = denoised.get()
     return denoised
 
 
+def _parallel_bilateral(image: np.ndarray, d: int = 5, n_threads: Optional[int] = None) -> np.ndarray:
+    """
+    Bilateral filter applied to horizontal stripes in worker threads.
+
+    Each stripe is filtered with d // 2 rows of overlap from its neighbours,
+    so the result is identical to filtering the whole image at once.
+    OpenCV releases the GIL, so stripes run concurrently.
+    """
+    h = image.shape[0]
+    n_threads = max(1, min(n_threads or os.cpu_count() or 1, h))
+    radius = d // 2
+    bounds = np.linspace(0, h, n_threads + 1).astype(int)
+    out = np.empty_like(image)
+
+    def filter_stripe(i: int) -> None:
+        y0, y1 = bounds[i], bounds[i + 1]
+        top, bottom = max(y0 - radius, 0), min(y1 + radius, h)
+        stripe = cv2.bilateralFilter(image[top:bottom], d=d, sigmaColor=50, sigmaSpace=50)
+        out[y0:y1] = stripe[y0 - top:y1 - top]
+
+    with ThreadPoolExecutor(max_workers=n_threads) as pool:
+        list(pool.map(filter_stripe, range(n_threads)))
+    return out
+
+
 def detect_plot_area(image: np.ndarray) -> Tuple[Tuple[int, int, int, int], float]:
     """
     Detect the plot area bounding box.
@@ -89,8 +156,9 @@ def remove_grid(image: np.ndarray) -> np.ndarray:
         image: Preprocessed grayscale image
 
     Returns:
-        Image with grid lines removed
+        Image with grid lines removed. Until removal is implemented this
+        is the input array itself; treat it as read-only.
     """
     # TODO: Implement grid removal
     # Use morphological operations with long horizontal/vertical kernels
-    return image.copy()
+    return image
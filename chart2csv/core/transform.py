@@ -2,13 +2,17 @@
 Pixel-to-value coordinate transformation.
 """
 
+import functools
+
 import numpy as np
-from typing import Dict, Any, Optional, Tuple, List
-from chart2csv.core.types import Scale
+from typing import Callable, Dict, Any, Optional, Tuple, List, Union
+from chart2csv.core.types import Scale, TickArray
+
+AxisTicks = Union[TickArray, List[Dict[str, Any]]]
 
 
 def build_transform(
-    ticks: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    ticks: Optional[Dict[str, AxisTicks]] = None,
     calibration_points: Optional[Dict[str, Any]] = None,
     x_scale: Scale = Scale.LINEAR,
     y_scale: Scale = Scale.LINEAR
@@ -17,7 +21,8 @@ def build_transform(
     Build pixel→value transformation from ticks or calibration.
 
     Args:
-        ticks: OCR tick data (from extract_tick_labels)
+        ticks: OCR tick data (from extract_tick_labels), or a TickArray
+            per axis
         calibration_points: Manual calibration data
         x_scale: X-axis scale (linear or log)
         y_scale: Y-axis scale (linear or log)
@@ -32,13 +37,38 @@ def build_transform(
         return _build_from_calibration(calibration_points, x_scale, y_scale)
     elif ticks:
         # Use OCR ticks
-        return _build_from_ticks(ticks, x_scale, y_scale)
+        if any(isinstance(points, TickArray) for points in ticks.values()):
+            return _build_from_ticks(ticks, x_scale, y_scale)
+
+        # Tick dicts are memoized on their (pixel, value) pairs: re-running
+        # the same chart (sweeps, debugging) skips the fit
+        pairs = tuple(
+            tuple((p["pixel"], p["value"]) for p in ticks.get(axis_name, ()))
+            for axis_name in ("x", "y")
+        )
+        transform, fit_error = _build_from_tick_pairs(pairs, x_scale, y_scale)
+        # Callers own the returned dict; keep the cached one intact
+        return {axis: dict(params) for axis, params in transform.items()}, fit_error
     else:
         raise ValueError("Need either ticks or calibration_points")
 
 
+@functools.lru_cache(maxsize=64)
+def _build_from_tick_pairs(
+    pairs: Tuple[Tuple[Tuple[float, float], ...], ...],
+    x_scale: Scale,
+    y_scale: Scale
+) -> Tuple[Dict[str, Any], float]:
+    """Build transform from per-axis (pixel, value) pairs, cached."""
+    ticks = {}
+    for axis_name, axis_pairs in zip(("x", "y"), pairs):
+        arr = np.array(axis_pairs, dtype=np.float64).reshape(-1, 2)
+        ticks[axis_name] = TickArray(arr[:, 0], arr[:, 1])
+    return _build_from_ticks(ticks, x_scale, y_scale)
+
+
 def _build_from_ticks(
-    ticks: Dict[str, List[Dict[str, Any]]],
+    ticks: Dict[str, AxisTicks],
     x_scale: Scale,
     y_scale: Scale
 ) -> Tuple[Dict[str, Any], float]:
@@ -54,27 +84,17 @@ def _build_from_ticks(
             transform[axis_name] = {"a": 1.0, "b": 0.0, "scale": "linear"}
             continue
 
-        pixels = np.array([p["pixel"] for p in points])
-        values = np.array([p["value"] for p in points])
+        if isinstance(points, TickArray):
+            # _fit_axis works in place on the values
+            pixels = np.asarray(points.pixels, dtype=np.float64)
+            values = np.array(points.values, dtype=np.float64)
+        else:
+            arrays = TickArray.from_points(points)
+            pixels, values = arrays.pixels, arrays.values
         scale = x_scale if axis_name == "x" else y_scale
 
-        if scale == Scale.LOG:
-            # Avoid log(0)
-            values = np.clip(values, 1e-10, None)
-            target_values = np.log10(values)
-        else:
-            target_values = values
-
-        # Perform linear fit: target_value = a * pixel + b
-        # Using polyfit for 1st degree polynomial
-        a, b = np.polyfit(pixels, target_values, 1)
-        
-        # Calculate residual error
-        preds = a * pixels + b
-        error = np.mean(np.abs(preds - target_values))
-        if np.mean(np.abs(target_values)) > 0:
-            error /= np.mean(np.abs(target_values))
-        
+        a, b, error = _fit_axis(pixels, values, scale == Scale.LOG)
+
         total_fit_error += error
         axes_processed += 1
 
@@ -89,6 +109,53 @@ def _build_from_ticks(
     return transform, avg_fit_error
 
 
+def _fit_axis(pixels: np.ndarray, values: np.ndarray, is_log: bool) -> Tuple[float, float, float]:
+    """
+    Fit one axis: value (or log10 value) = a * pixel + b.
+
+    Returns:
+        Tuple of (a, b, fit_error), where fit_error is the mean absolute
+        residual relative to the mean absolute target value
+    """
+    if is_log:
+        # Avoid log(0); values is our own copy, so work in place
+        np.maximum(values, 1e-10, out=values)
+        np.log10(values, out=values)
+
+    a, b = _fit_line(pixels, values)
+
+    # Calculate residual error, in one scratch buffer
+    residuals = np.multiply(pixels, a)
+    residuals += b
+    residuals -= values
+    np.abs(residuals, out=residuals)
+    error = residuals.mean()
+    np.abs(values, out=residuals)
+    scale = residuals.mean()
+    if scale > 0:
+        error /= scale
+    return a, b, float(error)
+
+
+def _fit_line(x: np.ndarray, y: np.ndarray) -> Tuple[float, float]:
+    """
+    Least-squares fit of y = a * x + b.
+
+    Closed form from the sums: a handful of tick points does not need
+    polyfit's Vandermonde matrix and LAPACK solve.
+    """
+    n = x.size
+    sx = x.sum()
+    sy = y.sum()
+    denom = n * np.dot(x, x) - sx * sx
+    if denom == 0:
+        # All points share one pixel position: no slope to fit
+        return 0.0, float(sy / n)
+    a = (n * np.dot(x, y) - sx * sy) / denom
+    b = (sy - a * sx) / n
+    return float(a), float(b)
+
+
 def _build_from_calibration(
     calibration_points: Dict[str, Any],
     x_scale: Scale,
@@ -136,9 +203,59 @@ def _build_from_calibration(
     return transform, fit_error
 
 
+def compile_transform(
+    transform: Dict[str, Any],
+    dtype: Any = np.float64
+) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Specialize a transform into a function of Nx2 pixel coordinates.
+
+    Coefficients and the log-scaled axes are resolved once, so applying
+    the same transform to many point sets skips the dict lookups and
+    scale checks.
+
+    Args:
+        transform: Transform dict from build_transform()
+        dtype: Output precision. np.float32 halves memory traffic for
+            large point sets (e.g. overlays); log axes always use float64
+            to keep their dynamic range.
+
+    Returns:
+        Function (pixel_coords, out=None) -> values, see apply_transform()
+    """
+    tx, ty = transform["x"], transform["y"]
+    log_axes = tuple(i for i, t in enumerate((tx, ty)) if t["scale"] != "linear")
+    if log_axes:
+        dtype = np.float64
+
+    coeffs = np.array([[tx["a"], tx["b"]], [ty["a"], ty["b"]]], dtype=dtype)
+    a, b = coeffs[:, :1], coeffs[:, 1:]
+
+    def transform_points(pixel_coords: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        # Column-major output: each axis is a contiguous row of result.T, so
+        # both axes are computed in one broadcast pass over long inner loops.
+        # Every element is written below, so no zero-fill is needed.
+        result = np.empty_like(pixel_coords, dtype=dtype, order="F") if out is None else out
+        columns = result.T
+
+        # Linear: value = a * pixel + b
+        np.multiply(pixel_coords.T, a, out=columns, dtype=dtype)
+        columns += b
+
+        # Log: value = 10^(a * pixel + b)
+        for i in log_axes:
+            np.power(10.0, columns[i], out=columns[i])
+
+        return result
+
+    return transform_points
+
+
 def apply_transform(
     pixel_coords: np.ndarray,
-    transform: Dict[str, Any]
+    transform: Dict[str, Any],
+    dtype: Any = np.float64,
+    out: Optional[np.ndarray] = None
 ) -> np.ndarray:
     """
     Apply pixel→value transformation to coordinates.
@@ -146,24 +263,12 @@ def apply_transform(
     Args:
         pixel_coords: Nx2 array of (x_pixel, y_pixel)
         transform: Transform dict from build_transform()
+        dtype: Output precision, see compile_transform()
+        out: Optional Nx2 buffer to write the values into, so batches can
+            reuse one allocation. Column-major buffers are fastest.
 
     Returns:
-        Nx2 array of (x_value, y_value)
+        Nx2 array of (x_value, y_value), in column-major (Fortran) order;
+        out itself when given
     """
-    result = np.zeros_like(pixel_coords, dtype=float)
-
-    for i, axis in enumerate(["x", "y"]):
-        t = transform[axis]
-        pixels = pixel_coords[:, i]
-
-        if t["scale"] == "linear":
-            # Linear: value = a * pixel + b
-            values = t["a"] * pixels + t["b"]
-        else:
-            # Log: value = 10^(a * pixel + b)
-            log_values = t["a"] * pixels + t["b"]
-            values = np.power(10, log_values)
-
-        result[:, i] = values
-
-    return result
+    return compile_transform(transform, dtype)(pixel_coords, out)
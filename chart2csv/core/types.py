@@ -233,3 +233,24 @@ class Tick:
     ocr_text: Optional[str] = None
     confidence: float = 0.0
     parsed: bool = False
+
+
+@dataclass
+class TickArray:
+    """Parsed ticks of one axis as parallel arrays (pixel -> value)."""
+    pixels: np.ndarray
+    values: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.pixels)
+
+    @classmethod
+    def from_points(cls, points: List[Dict[str, Any]]) -> "TickArray":
+        """Build from OCR tick dicts ({"pixel": ..., "value": ...})."""
+        # Fill both arrays in one pass over the tick dicts
+        pixels = np.empty(len(points), dtype=np.float64)
+        values = np.empty(len(points), dtype=np.float64)
+        for i, p in enumerate(points):
+            pixels[i] = p["pixel"]
+            values[i] = p["value"]
+        return cls(pixels, values)
@@ -0,0 +1,272 @@
+
+import io
+import json
+import os
+import struct
+import zlib
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from PIL import Image
+from fastapi import HTTPException, UploadFile
+
+from api.main import (
+    ExtractionResult,
+    RateLimiter,
+    ResultCache,
+    _process_chart_extraction,
+    app,
+    extraction_response,
+    lifespan,
+    parse_csv_to_data,
+    points_to_csv,
+    upload_to_temp_path,
+    validate_extraction_options,
+    validate_image_file,
+)
+
+
+def make_png(width=20, height=10):
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), "white").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def make_png_header(width, height):
+    """PNG signature and IHDR chunk only; enough for PIL to read the size."""
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    chunk = b"IHDR" + ihdr
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", len(ihdr)) + chunk + struct.pack(">I", zlib.crc32(chunk))
+
+
+class TestRateLimiter(unittest.TestCase):
+    @patch('api.main.time.monotonic')
+    def test_sliding_window(self, mock_monotonic):
+        limiter = RateLimiter(requests_per_minute=2)
+
+        mock_monotonic.return_value = 100.0
+        self.assertTrue(limiter.is_allowed("1.2.3.4"))
+        self.assertTrue(limiter.is_allowed("1.2.3.4"))
+        self.assertFalse(limiter.is_allowed("1.2.3.4"))
+
+        # Other keys are tracked independently
+        self.assertTrue(limiter.is_allowed("5.6.7.8"))
+
+        # Once the window has passed, the key is admitted again
+        mock_monotonic.return_value = 160.0
+        self.assertTrue(limiter.is_allowed("1.2.3.4"))
+
+    @patch('api.main.time.monotonic')
+    def test_tracked_keys_are_bounded(self, mock_monotonic):
+        limiter = RateLimiter(requests_per_minute=5, max_tracked_keys=2, idle_eviction=300.0)
+
+        mock_monotonic.return_value = 0.0
+        limiter.is_allowed("a")
+        limiter.is_allowed("b")
+        limiter.is_allowed("a")  # refresh "a" so "b" is least recently seen
+        limiter.is_allowed("c")
+        self.assertEqual(list(limiter.requests), ["a", "c"])
+
+        # Idle keys are swept before a new key is admitted
+        mock_monotonic.return_value = 400.0
+        limiter.is_allowed("d")
+        self.assertEqual(list(limiter.requests), ["d"])
+
+
+class TestParseCsvToData(unittest.TestCase):
+    def test_numeric_and_text_columns(self):
+        data = parse_csv_to_data('month,value\n"Jan, 2024",1.5\nFeb,2\n')
+        self.assertEqual(data, [
+            {"month": "Jan, 2024", "value": 1.5},
+            {"month": "Feb", "value": 2.0},
+        ])
+
+    def test_skips_ragged_rows(self):
+        data = parse_csv_to_data("x,y\n1,2\n3\n4,n/a")
+        self.assertEqual(data, [{"x": 1.0, "y": 2.0}, {"x": 4.0, "y": "n/a"}])
+
+    def test_header_only(self):
+        self.assertEqual(parse_csv_to_data("x,y"), [])
+
+
+class TestPointsToCsv(unittest.TestCase):
+    def test_round_trip_precision(self):
+        points = np.array([[1.0, 0.1], [2.5, 1e-20]])
+        csv_content = points_to_csv(points)
+        self.assertEqual(csv_content, "x,y\n1.0,0.1\n2.5,1e-20")
+        self.assertEqual(parse_csv_to_data(csv_content), [
+            {"x": 1.0, "y": 0.1},
+            {"x": 2.5, "y": 1e-20},
+        ])
+
+    def test_empty(self):
+        self.assertEqual(points_to_csv(np.empty((0, 2))), "x,y")
+
+
+class TestValidateExtractionOptions(unittest.TestCase):
+    def test_accepts_known_values(self):
+        validate_extraction_options(None, "linear", "log")
+        validate_extraction_options("scatter", "linear", "linear")
+
+    def test_rejects_unknown_values(self):
+        for args in (("pie", "linear", "linear"), (None, "linear", "sqrt")):
+            with self.assertRaises(HTTPException) as ctx:
+                validate_extraction_options(*args)
+            self.assertEqual(ctx.exception.status_code, 400)
+
+
+class TestExtractionResponse(unittest.IsolatedAsyncioTestCase):
+    def make_result(self, num_points):
+        return ExtractionResult(
+            success=True,
+            chart_type="scatter",
+            confidence=0.9,
+            data=[{"x": float(i), "y": i / 3} for i in range(num_points)],
+            csv="x,y",
+            warnings=["[FEW_POINTS] test"],
+            processing_time_ms=12,
+        )
+
+    def test_small_result_returned_as_is(self):
+        result = self.make_result(10)
+        self.assertIs(extraction_response(result), result)
+
+    @patch('api.main.STREAM_BATCH_POINTS', 7)
+    @patch('api.main.STREAM_THRESHOLD_POINTS', 10)
+    async def test_large_result_is_streamed(self):
+        result = self.make_result(25)
+        response = extraction_response(result)
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        self.assertEqual(json.loads(body), result.model_dump())
+
+
+class TestValidateImageFile(unittest.TestCase):
+    def test_rejects_oversized_dimensions(self):
+        fd, path = tempfile.mkstemp(suffix=".png")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(make_png(width=10001, height=1))
+            with self.assertRaises(ValueError):
+                validate_image_file(path)
+        finally:
+            os.unlink(path)
+
+    def test_rejects_decompression_bomb(self):
+        fd, path = tempfile.mkstemp(suffix=".png")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(make_png_header(9500, 9500))
+            with self.assertRaises(ValueError):
+                validate_image_file(path)
+        finally:
+            os.unlink(path)
+
+    def test_rejects_corrupt_file(self):
+        fd, path = tempfile.mkstemp(suffix=".png")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(b"\x89PNG\r\n\x1a\n" + b"\x00" * 16)
+            with self.assertRaises(ValueError):
+                validate_image_file(path)
+        finally:
+            os.unlink(path)
+
+
+class TestUploadToTempPath(unittest.IsolatedAsyncioTestCase):
+    async def test_streams_png_unchanged(self):
+        png = make_png()
+        upload = UploadFile(io.BytesIO(png), filename="chart.png")
+
+        path, image_hash = await upload_to_temp_path(upload)
+        try:
+            self.assertEqual(len(image_hash), 32)
+            self.assertTrue(path.endswith(".png"))
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), png)
+        finally:
+            os.unlink(path)
+
+    async def test_rejects_unknown_format(self):
+        upload = UploadFile(io.BytesIO(b"GIF89a" + b"\x00" * 32), filename="chart.gif")
+        with self.assertRaises(ValueError):
+            await upload_to_temp_path(upload)
+
+    @patch('api.main.MAX_UPLOAD_BYTES', 64)
+    async def test_rejects_oversized_upload(self):
+        upload = UploadFile(io.BytesIO(make_png()), filename="chart.png")
+        with self.assertRaises(ValueError):
+            await upload_to_temp_path(upload)
+
+
+class TestResultCache(unittest.IsolatedAsyncioTestCase):
+    def test_lru_eviction(self):
+        cache = ResultCache(maxsize=2)
+        cache.put(("a",), 1)
+        cache.put(("b",), 2)
+        cache.get(("a",))
+        cache.put(("c",), 3)
+        self.assertIsNone(cache.get(("b",)))
+        self.assertEqual(cache.get(("a",)), 1)
+        self.assertEqual(cache.get(("c",)), 3)
+
+    @patch('api.main.result_cache', ResultCache())
+    @patch('api.main.extract_chart_llm')
+    async def test_duplicate_image_skips_extraction(self, mock_llm):
+        mock_llm.return_value = ({"chart_type": "line", "data": [{"x": 1, "y": 2}]}, 0.7)
+
+        results = []
+        for _ in range(2):
+            fd, path = tempfile.mkstemp(suffix=".png")
+            with os.fdopen(fd, "wb") as f:
+                f.write(make_png())
+            results.append(await _process_chart_extraction(path, image_hash="abc"))
+            self.assertFalse(os.path.exists(path))
+
+        self.assertEqual(mock_llm.call_count, 1)
+        # Repeat uploads are served by ResultCache, not the on-disk cache
+        self.assertEqual(mock_llm.call_args.kwargs, {"use_cache": False})
+        self.assertEqual(results[1].data, results[0].data)
+        self.assertEqual(results[1].processing_time_ms, 0)
+
+
+class TestCvProcessPool(unittest.IsolatedAsyncioTestCase):
+    def write_temp(self, content):
+        fd, path = tempfile.mkstemp(suffix=".png")
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        return path
+
+    @patch('api.main.CV_PROCESSES', 1)
+    async def test_extraction_runs_in_spawned_worker(self):
+        calibration = {"x": [[10, 0], [100, 10]], "y": [[100, 0], [10, 10]]}
+
+        async with lifespan(app):
+            self.assertEqual(app.state.cv_pool._max_workers, 1)
+
+            # The pipeline's ChartResult is pickled back from the worker
+            result = await _process_chart_extraction(
+                self.write_temp(make_png(160, 120)),
+                mode="cv",
+                calibration_points=calibration,
+                use_mistral=False,
+            )
+            self.assertTrue(result.success)
+            self.assertEqual(result.data, [])
+            self.assertEqual(result.warnings[0], "[CALIBRATED] Using user-provided calibration points")
+
+            # Exceptions raised in the worker reach the caller: the header
+            # passes validation in this process, decoding fails in the worker
+            bad_path = self.write_temp(make_png(160, 120)[:-30])
+            with self.assertRaisesRegex(ValueError, "Failed to load image"):
+                await _process_chart_extraction(bad_path, mode="cv", use_mistral=False)
+            self.assertFalse(os.path.exists(bad_path))
+
+        # Lifespan shutdown doesn't wait; reap the worker before other tests
+        app.state.cv_pool.shutdown(wait=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
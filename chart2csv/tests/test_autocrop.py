@@ -0,0 +1,40 @@
+
+import unittest
+
+import cv2
+import numpy as np
+
+from chart2csv.core.autocrop import detect_plot_area, detect_plot_area_contour
+
+
+class TestDetectPlotArea(unittest.TestCase):
+    def test_projection_finds_axes(self):
+        img = np.full((400, 600, 3), 255, dtype=np.uint8)
+        cv2.line(img, (60, 30), (60, 350), (0, 0, 0), 2)    # Y-axis
+        cv2.line(img, (60, 350), (580, 350), (0, 0, 0), 2)  # X-axis
+
+        crop_box, confidence = detect_plot_area(img, margin=5)
+
+        x1, y1, x2, y2 = crop_box
+        self.assertAlmostEqual(x1, 65, delta=2)
+        self.assertAlmostEqual(y1, 35, delta=2)
+        self.assertAlmostEqual(x2, 575, delta=2)
+        self.assertAlmostEqual(y2, 344, delta=2)
+        self.assertEqual(confidence, 0.9)
+
+    def test_blank_image_falls_back(self):
+        img = np.full((100, 100, 3), 255, dtype=np.uint8)
+        self.assertEqual(detect_plot_area(img), ((10, 10, 90, 90), 0.3))
+
+
+class TestDetectPlotAreaContour(unittest.TestCase):
+    def test_gray_and_bgr_inputs_agree(self):
+        img = np.full((400, 600, 3), 120, dtype=np.uint8)
+        cv2.rectangle(img, (60, 30), (580, 350), (255, 255, 255), -1)
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+        self.assertEqual(detect_plot_area_contour(img), ((70, 40, 571, 341), 0.7))
+        self.assertEqual(detect_plot_area_contour(gray), detect_plot_area_contour(img))
+
+if __name__ == '__main__':
+    unittest.main()
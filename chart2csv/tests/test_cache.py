@@ -0,0 +1,81 @@
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from chart2csv.core.cache import (
+    clear_cache,
+    get_cache_dir,
+    get_cached_points,
+    get_cached_result,
+    save_points,
+    save_to_cache,
+)
+
+
+class TestPointsCache(unittest.TestCase):
+    def setUp(self):
+        self.home = tempfile.TemporaryDirectory()
+        patcher = patch.dict(os.environ, {"HOME": self.home.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.home.cleanup)
+
+    def test_round_trip_keyed_by_method_and_crop(self):
+        image = np.random.default_rng(0).integers(0, 255, (120, 160, 3), dtype=np.uint8)
+        points = np.array([[1.5, 2.0], [30.0, 40.25]])
+
+        self.assertIsNone(get_cached_points(image, "scatter", (0, 0, 100, 100)))
+        save_points(image, points, 0.8, "scatter", (0, 0, 100, 100))
+
+        cached_points, confidence = get_cached_points(image, "scatter", (0, 0, 100, 100))
+        np.testing.assert_array_equal(cached_points, points)
+        self.assertEqual(confidence, 0.8)
+
+        self.assertIsNone(get_cached_points(image, "line", (0, 0, 100, 100)))
+        self.assertIsNone(get_cached_points(image, "scatter", (0, 0, 90, 100)))
+
+        # Any pixel change is a miss
+        changed = image.copy()
+        changed[60, 80, 0] ^= 1
+        self.assertIsNone(get_cached_points(changed, "scatter", (0, 0, 100, 100)))
+
+        self.assertEqual(clear_cache(), 1)
+        self.assertIsNone(get_cached_points(image, "scatter", (0, 0, 100, 100)))
+
+
+class TestOcrCache(unittest.TestCase):
+    def setUp(self):
+        self.home = tempfile.TemporaryDirectory()
+        patcher = patch.dict(os.environ, {"HOME": self.home.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.home.cleanup)
+
+    def test_json_round_trip(self):
+        image = np.full((40, 60, 3), 200, dtype=np.uint8)
+        result = {"x": [{"pixel": 10, "value": np.float64(1.5), "text": "1.5"}], "y": []}
+
+        self.assertIsNone(get_cached_result(image, backend="mistral"))
+        save_to_cache(image, result, 0.9, backend="mistral")
+
+        cached = get_cached_result(image, backend="mistral")
+        self.assertEqual(cached["result"]["x"], [{"pixel": 10, "value": 1.5, "text": "1.5"}])
+        self.assertEqual(cached["confidence"], 0.9)
+        # Plain JSON on disk, no temporary files left behind
+        self.assertEqual([f.suffix for f in get_cache_dir().iterdir()], [".json"])
+
+    def test_corrupt_entry_is_a_miss(self):
+        image = np.zeros((10, 10, 3), dtype=np.uint8)
+        save_to_cache(image, {"x": [], "y": []}, 0.5)
+        for f in get_cache_dir().iterdir():
+            f.write_bytes(b"{not json")
+
+        self.assertIsNone(get_cached_result(image))
+
+
+if __name__ == '__main__':
+    unittest.main()
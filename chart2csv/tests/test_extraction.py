@@ -0,0 +1,72 @@
+
+import unittest
+
+import cv2
+import numpy as np
+
+from chart2csv.core.extraction import (
+    extract_line_points,
+    extract_scatter_points,
+    extract_scatter_points_color,
+)
+
+
+class TestScatterColor(unittest.TestCase):
+    def test_centroids_and_shape_filter(self):
+        img = np.full((200, 300, 3), 255, dtype=np.uint8)
+        centers = [(50, 40), (150, 100), (250, 160)]
+        for c in centers:
+            cv2.circle(img, c, 5, (255, 0, 0), -1)
+        # Colored line: too elongated to be a point
+        cv2.line(img, (20, 175), (280, 175), (0, 0, 255), 2)
+
+        points, confidence = extract_scatter_points_color(img, crop_box=(10, 10, 290, 180))
+
+        points = points[np.argsort(points[:, 0])]
+        np.testing.assert_allclose(points, centers, atol=0.5)
+        self.assertGreaterEqual(confidence, 0.7)
+
+    def test_triangle_and_diamond_markers(self):
+        img = np.full((200, 400, 3), 255, dtype=np.uint8)
+        centers = [(40 + 35 * i, 60 + 9 * i) for i in range(10)]
+        for i, (cx, cy) in enumerate(centers):
+            if i % 2:
+                # Diamond
+                shape = [(cx, cy - 7), (cx + 7, cy), (cx, cy + 7), (cx - 7, cy)]
+            else:
+                # Triangle; compare against its bbox centre below
+                shape = [(cx, cy - 7), (cx + 7, cy + 7), (cx - 7, cy + 7)]
+            cv2.fillPoly(img, [np.array(shape, dtype=np.int32)], (0, 160, 0))
+
+        for extract in (extract_scatter_points_color, extract_scatter_points):
+            points, confidence = extract(img, crop_box=(10, 10, 390, 190))
+
+            self.assertEqual(len(points), 10)
+            points = points[np.argsort(points[:, 0])]
+            np.testing.assert_allclose(points[:, 0], [c[0] for c in centers], atol=1.0)
+            np.testing.assert_allclose(points[:, 1], [c[1] for c in centers], atol=3.0)
+            self.assertGreaterEqual(confidence, 0.7)
+
+    def test_no_points(self):
+        img = np.full((50, 50, 3), 255, dtype=np.uint8)
+        points, confidence = extract_scatter_points_color(img)
+        self.assertEqual(points.shape, (0, 2))
+        self.assertEqual(confidence, 0.1)
+
+
+class TestLinePoints(unittest.TestCase):
+    def test_column_means(self):
+        img = np.full((300, 600, 3), 255, dtype=np.uint8)
+        cv2.line(img, (20, 250), (580, 30), (0, 0, 0), 4)
+
+        points, confidence = extract_line_points(img, crop_box=(5, 5, 595, 295))
+
+        # One point per covered column, sorted by X, tracking the line
+        self.assertTrue(np.all(np.diff(points[:, 0]) == 1))
+        expected_y = 250 + (points[:, 0] - 20) * (30 - 250) / (580 - 20)
+        np.testing.assert_allclose(points[:, 1], expected_y, atol=2.0)
+        self.assertGreater(confidence, 0.9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,286 @@
+
+import asyncio
+import base64
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import cv2
+import numpy as np
+
+from chart2csv.core import llm_extraction
+from chart2csv.core.llm_extraction import (
+    extract_chart_llm,
+    extract_charts_llm_async,
+    extract_charts_llm_marshaled,
+    llm_result_to_array,
+    llm_result_to_csv,
+)
+
+
+def make_response(content):
+    response = MagicMock()
+    response.choices[0].message.content = content
+    return response
+
+
+def make_stream(content, chunk_size=5, consumed=None):
+    """Fake chat.stream context manager yielding content in small deltas."""
+    def events():
+        for i in range(0, len(content), chunk_size):
+            if consumed is not None:
+                consumed.append(i)
+            event = MagicMock()
+            event.data.choices[0].delta.content = content[i:i + chunk_size]
+            yield event
+
+    stream = MagicMock()
+    stream.__enter__.return_value = events()
+    return stream
+
+
+class TestExtractChartCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        patcher = patch.dict(os.environ, {"HOME": self.tmpdir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.path = os.path.join(self.tmpdir.name, "chart.png")
+        cv2.imwrite(self.path, np.full((20, 20, 3), 7, dtype=np.uint8))
+
+    def test_repeat_call_skips_api(self):
+        client = MagicMock()
+        client.chat.stream.return_value = make_stream('{"data": [{"x": 1, "y": 2}]}')
+
+        with patch.object(llm_extraction, "_create_client", return_value=client) as create:
+            first = extract_chart_llm(self.path)
+            second = extract_chart_llm(self.path)
+            self.assertEqual(create.call_count, 1)
+
+        self.assertEqual(client.chat.stream.call_count, 1)
+        self.assertEqual(first[0]["data"], [{"x": 1, "y": 2}])
+        self.assertEqual(second, first)
+
+    def test_failed_parse_is_not_cached(self):
+        client = MagicMock()
+        client.chat.stream.side_effect = lambda **kwargs: make_stream("no json here")
+
+        with patch.object(llm_extraction, "_create_client", return_value=client):
+            extract_chart_llm(self.path)
+            extract_chart_llm(self.path)
+
+        self.assertEqual(client.chat.stream.call_count, 2)
+
+
+class TestChartDataUrl(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def write(self, name, image):
+        path = os.path.join(self.tmpdir.name, name)
+        cv2.imwrite(path, image)
+        return path
+
+    def test_small_png_passes_through(self):
+        path = self.write("chart.png", np.full((30, 40, 3), 9, dtype=np.uint8))
+        with open(path, "rb") as f:
+            expected = "data:image/png;base64," + base64.b64encode(f.read()).decode()
+        self.assertEqual(llm_extraction._load_image_base64(path), expected)
+
+    def test_large_or_other_formats_are_reencoded(self):
+        large = self.write("large.png", np.zeros((100, 2000, 3), dtype=np.uint8))
+        bmp = self.write("chart.bmp", np.zeros((30, 40, 3), dtype=np.uint8))
+        for path in (large, bmp):
+            self.assertTrue(llm_extraction._load_image_base64(path).startswith("data:image/jpeg;base64,"))
+
+    def test_unreadable(self):
+        with self.assertRaises(ValueError):
+            llm_extraction._load_image_base64(os.path.join(self.tmpdir.name, "missing.png"))
+        path = os.path.join(self.tmpdir.name, "bad.png")
+        with open(path, "wb") as f:
+            f.write(b"not an image")
+        with self.assertRaises(ValueError):
+            llm_extraction._load_image_base64(path)
+
+
+class TestStreamChartContent(unittest.TestCase):
+    def test_stops_after_chart_object(self):
+        reply = (
+            'Axes {roughly} 0-10.\n```json\n{"x_label": "a}\\"{", "data": [{"x": 1, "y": 2}]}\n```\n'
+            "VERIFICATION: the data array has one point, as counted. " * 5
+        )
+        consumed = []
+        client = MagicMock()
+        client.chat.stream.return_value = make_stream(reply, consumed=consumed)
+
+        content = llm_extraction._stream_chart_content(client, model="m")
+
+        result, _ = llm_extraction._parse_chart_response(content)
+        self.assertEqual(result["data"], [{"x": 1, "y": 2}])
+        self.assertEqual(result["x_label"], 'a}"{')
+        self.assertLess(len(consumed) * 5, len(reply) // 2)
+
+
+class TestExtractChartsAsync(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.paths = []
+        for i in range(5):
+            path = os.path.join(self.tmpdir.name, f"chart{i}.png")
+            cv2.imwrite(path, np.full((20, 20, 3), i, dtype=np.uint8))
+            self.paths.append(path)
+
+    async def test_bounded_fan_out_keeps_input_order(self):
+        in_flight = 0
+        peak = 0
+
+        async def complete_async(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            image_url = kwargs["messages"][0]["content"][1]["image_url"]
+            x = self.b64s.index(image_url)
+            return make_response(f'{{"data": [{{"x": {x}, "y": 1}}]}}')
+
+        self.b64s = [llm_extraction._load_image_base64(p) for p in self.paths]
+        client = MagicMock()
+        client.chat.complete_async = complete_async
+
+        with patch.object(llm_extraction, "_create_client", return_value=client):
+            results = await extract_charts_llm_async(
+                self.paths + [os.path.join(self.tmpdir.name, "missing.png")],
+                concurrency=2,
+                stagger=0,
+            )
+
+        self.assertEqual([r["data"][0]["x"] for r, _ in results[:5]], [0, 1, 2, 3, 4])
+        self.assertIn("error", results[5][0])
+        self.assertEqual(results[5][1], 0.0)
+        self.assertEqual(peak, 2)
+
+
+    async def test_first_wave_is_staggered(self):
+        loop = asyncio.get_running_loop()
+        starts = []
+
+        async def complete_async(**kwargs):
+            starts.append(loop.time())
+            return make_response('{"data": []}')
+
+        client = MagicMock()
+        client.chat.complete_async = complete_async
+
+        # Loading is stubbed so decode time can't eat into the measured gaps
+        with patch.object(llm_extraction, "_create_client", return_value=client), \
+             patch.object(llm_extraction, "_load_image_base64", return_value="data:image/png;base64,"):
+            await extract_charts_llm_async(self.paths[:3], concurrency=3, stagger=0.05)
+
+        gaps = np.diff(sorted(starts))
+        self.assertTrue(np.all(gaps >= 0.04), gaps)
+
+    async def test_stagger_with_more_paths_than_concurrency(self):
+        loop = asyncio.get_running_loop()
+        paths = []
+        for i in range(12):
+            path = os.path.join(self.tmpdir.name, f"many{i}.png")
+            cv2.imwrite(path, np.full((20, 20, 3), 10 + i, dtype=np.uint8))
+            paths.append(path)
+        b64s = [llm_extraction._load_image_base64(p) for p in paths]
+        starts = {}
+
+        async def complete_async(**kwargs):
+            image_url = kwargs["messages"][0]["content"][1]["image_url"]
+            starts[b64s.index(image_url)] = loop.time()
+            await asyncio.sleep(0.2)
+            return make_response('{"data": []}')
+
+        client = MagicMock()
+        client.chat.complete_async = complete_async
+
+        with patch.object(llm_extraction, "_create_client", return_value=client):
+            await extract_charts_llm_async(paths, concurrency=4, stagger=0.05)
+
+        # The first wave is the first four inputs, started 0.05s apart
+        first_wave = [starts[i] for i in range(4)]
+        self.assertEqual(min(starts.values()), first_wave[0])
+        self.assertTrue(np.all(np.diff(first_wave) >= 0.04), first_wave)
+        # Later inputs wait for a slot instead of jumping ahead of it
+        self.assertTrue(all(starts[i] >= starts[3] for i in range(4, 12)))
+
+
+class TestExtractChartsMarshaled(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.paths = []
+        for i in range(5):
+            path = os.path.join(self.tmpdir.name, f"chart{i}.png")
+            cv2.imwrite(path, np.full((20, 20, 3), i, dtype=np.uint8))
+            self.paths.append(path)
+
+    def test_groups_are_demultiplexed_by_id(self):
+        calls = []
+
+        def complete(**kwargs):
+            images = kwargs["messages"][0]["content"][1:]
+            calls.append(len(images))
+            # Reply out of order and drop the last chart of the first group
+            ids = list(range(len(images)))[::-1]
+            if len(calls) == 1:
+                ids = ids[1:]
+            entries = ",".join(
+                f'{{"id": {i}, "data": [{{"x": {len(calls)}, "y": {i}}}]}}' for i in ids
+            )
+            return make_response(f'```json\n{{"results": [{entries}]}}\n```')
+
+        client = MagicMock()
+        client.chat.complete = complete
+
+        with patch.object(llm_extraction, "_create_client", return_value=client):
+            results = extract_charts_llm_marshaled(
+                self.paths[:3] + [os.path.join(self.tmpdir.name, "missing.png")] + self.paths[3:],
+                k=3,
+            )
+
+        self.assertEqual(calls, [3, 2])
+        self.assertEqual([r["data"][0] for r, _ in results[:2]], [{"x": 1, "y": 0}, {"x": 1, "y": 1}])
+        self.assertIn("error", results[2][0])
+        self.assertIn("error", results[3][0])
+        self.assertEqual([r["data"][0] for r, _ in results[4:]], [{"x": 2, "y": 0}, {"x": 2, "y": 1}])
+        self.assertGreater(results[0][1], 0.0)
+
+
+class TestLlmResultToArray(unittest.TestCase):
+    def test_clean_data(self):
+        arr = llm_result_to_array({"data": [{"x": 1, "y": "2.5"}, {"x": 3.0}]})
+        np.testing.assert_array_equal(arr, [[1.0, 2.5], [3.0, 0.0]])
+
+    def test_bad_points_are_skipped(self):
+        arr = llm_result_to_array({"data": [{"x": 1, "y": 2}, {"x": None, "y": 1}, "bad", {"x": "n/a", "y": 3}]})
+        np.testing.assert_array_equal(arr, [[1.0, 2.0]])
+
+    def test_empty(self):
+        self.assertEqual(llm_result_to_array({}).shape, (0, 2))
+
+
+class TestLlmResultToCsv(unittest.TestCase):
+    def test_rows_and_quoted_labels(self):
+        result = {
+            "x_label": "Year",
+            "y_label": "Revenue, $M",
+            "data": [{"x": 2020, "y": 1.5}, "bad point", {"x": 2021}],
+        }
+        self.assertEqual(llm_result_to_csv(result), 'Year,"Revenue, $M"\n2020,1.5\n2021,')
+
+    def test_default_header(self):
+        self.assertEqual(llm_result_to_csv({"data": []}), "x,y")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,7 +8,9 @@ import numpy as np
 import sys
 sys.modules['mistralai'] = MagicMock()
 
-from chart2csv.core.mistral_ocr import MistralOCRBackend, extract_numbers_from_mistral, parse_numbers_from_text
+import json
+
+from chart2csv.core.mistral_ocr import MistralOCRBackend, call_with_retry, encode_image_base64, extract_numbers_from_mistral, find_json_object, limit_image_size, parse_numbers_from_text, run_chat_batch
 from chart2csv.core.ocr import extract_tick_labels
 
 class TestMistralOCR(unittest.TestCase):
@@ -83,5 +85,156 @@ class TestMistralOCR(unittest.TestCase):
         self.assertEqual(ticks_data["y"][0]["value"], 5)
         self.assertEqual(ticks_data["y"][1]["value"], 10)
 
+class TestEncodeImageBase64(unittest.TestCase):
+    def test_formats_round_trip(self):
+        import base64
+        import cv2
+
+        image = np.full((40, 200, 3), 255, dtype=np.uint8)
+        cv2.putText(image, "0 10 20", (5, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
+
+        for fmt, mime in (("png", "png"), ("webp", "webp"), ("jpeg", "jpeg")):
+            url = encode_image_base64(image, fmt)
+            header, payload = url.split(",", 1)
+            self.assertEqual(header, f"data:image/{mime};base64")
+            decoded = cv2.imdecode(np.frombuffer(base64.b64decode(payload), np.uint8), cv2.IMREAD_COLOR)
+            if fmt == "jpeg":
+                self.assertLess(np.abs(decoded.astype(int) - image).mean(), 2.0)
+            else:
+                np.testing.assert_array_equal(decoded, image)
+
+    def test_limit_image_size(self):
+        strip = np.zeros((60, 1600, 3), dtype=np.uint8)
+        self.assertEqual(limit_image_size(strip, 800).shape, (30, 800, 3))
+        small = np.zeros((60, 400, 3), dtype=np.uint8)
+        self.assertIs(limit_image_size(small, 800), small)
+
+
+class TestFindJsonObject(unittest.TestCase):
+    def test_fenced_with_prose(self):
+        text = 'Here you go:\n```json\n{"x": [1, 2], "label": "a } b"}\n```\nDone {not json}.'
+        self.assertEqual(find_json_object(text), {"x": [1, 2], "label": "a } b"})
+
+    def test_picks_largest_of_several(self):
+        text = 'Example: {"x": []}\nAnswer: {"x": [0, 10, 20], "y": [{"v": 1}]} and {"y": 2}'
+        self.assertEqual(find_json_object(text), {"x": [0, 10, 20], "y": [{"v": 1}]})
+
+    def test_no_object(self):
+        self.assertIsNone(find_json_object('[1, 2] {"unterminated": '))
+
+
+class APIError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class TestCallWithRetry(unittest.TestCase):
+    @patch('chart2csv.core.mistral_ocr.time.sleep')
+    def test_retries_transient_errors(self, mock_sleep):
+        func = MagicMock(side_effect=[ConnectionError(), APIError(503), "ok"])
+        self.assertEqual(call_with_retry(func, 1, key="v"), "ok")
+        self.assertEqual(func.call_count, 3)
+        func.assert_called_with(1, key="v")
+        first, second = (c.args[0] for c in mock_sleep.call_args_list)
+        self.assertLess(first, second)
+
+    @patch('chart2csv.core.mistral_ocr.time.sleep')
+    def test_gives_up(self, mock_sleep):
+        func = MagicMock(side_effect=APIError(429))
+        with self.assertRaises(APIError):
+            call_with_retry(func)
+        self.assertEqual(func.call_count, 3)
+
+    @patch('chart2csv.core.mistral_ocr.time.sleep')
+    def test_client_errors_not_retried(self, mock_sleep):
+        func = MagicMock(side_effect=APIError(400))
+        with self.assertRaises(APIError):
+            call_with_retry(func)
+        self.assertEqual(func.call_count, 1)
+        mock_sleep.assert_not_called()
+
+
+class TestMistralBatch(unittest.TestCase):
+    def make_client(self, replies):
+        client = MagicMock()
+        client.batch.jobs.create.return_value = MagicMock(id="job", status="QUEUED")
+        client.batch.jobs.get.return_value = MagicMock(id="job", status="SUCCESS", output_file="out")
+        lines = []
+        for custom_id, content in replies:
+            if content is None:
+                record = {"custom_id": custom_id, "error": {"message": "boom"}}
+            else:
+                record = {"custom_id": custom_id, "response": {
+                    "status_code": 200,
+                    "body": {"choices": [{"message": {"content": content}}]},
+                }}
+            lines.append(json.dumps(record))
+        client.files.download.return_value.iter_lines.return_value = lines
+        return client
+
+    def test_run_chat_batch_orders_by_custom_id(self):
+        # Output lines arrive out of order; request 1 failed
+        client = self.make_client([("2", "c"), ("0", "a"), ("1", None)])
+        requests = [{"messages": [{"role": "user", "content": str(i)}]} for i in range(3)]
+
+        contents = run_chat_batch(client, "model", requests, poll_interval=0)
+
+        self.assertEqual(contents, ["a", None, "c"])
+        uploaded = client.files.upload.call_args.kwargs["file"]["content"].decode().splitlines()
+        self.assertEqual([json.loads(line)["custom_id"] for line in uploaded], ["0", "1", "2"])
+        client.batch.jobs.create.assert_called_once_with(
+            input_files=[client.files.upload.return_value.id],
+            model="model",
+            endpoint="/v1/chat/completions",
+        )
+
+    @patch('chart2csv.core.mistral_ocr.get_mistral_client')
+    def test_process_axes_batch(self, mock_get_client):
+        mock_get_client.return_value = self.make_client([
+            ("0", '```json\n{"x": [0, 10], "y": [5]}\n```'),
+            ("1", "not json"),
+        ])
+        strip = np.zeros((20, 40, 3), dtype=np.uint8)
+
+        results = MistralOCRBackend().process_axes_batch([(strip, strip), (strip, strip)], poll_interval=0)
+
+        self.assertEqual(results, [([0.0, 10.0], [5.0]), ([], [])])
+
+
+class TestChartPlusAxes(unittest.TestCase):
+    @patch('chart2csv.core.mistral_ocr.get_mistral_client')
+    def test_single_call_demultiplexed(self, mock_get_client):
+        client = MagicMock()
+        client.chat.complete.return_value.choices[0].message.content = (
+            '{"chart": {"chart_type": "line", "data": [{"x": 1, "y": 2}]}, '
+            '"x_axis": [0, 10], "y_axis": ["5"]}'
+        )
+        mock_get_client.return_value = client
+        chart = np.zeros((300, 400, 3), dtype=np.uint8)
+        strip = np.zeros((20, 40, 3), dtype=np.uint8)
+
+        result, x_values, y_values = MistralOCRBackend().process_chart_plus_axes(chart, strip, strip)
+
+        self.assertEqual(result["data"], [{"x": 1, "y": 2}])
+        self.assertEqual((x_values, y_values), ([0.0, 10.0], [5.0]))
+        client.chat.complete.assert_called_once()
+        content = client.chat.complete.call_args.kwargs["messages"][0]["content"]
+        self.assertEqual([part["type"] for part in content], ["text"] + ["image_url"] * 3)
+        self.assertTrue(content[1]["image_url"].startswith("data:image/jpeg"))
+
+    @patch('chart2csv.core.mistral_ocr.get_mistral_client')
+    def test_missing_chart(self, mock_get_client):
+        client = MagicMock()
+        client.chat.complete.return_value.choices[0].message.content = '{"x_axis": [1], "y_axis": []}'
+        mock_get_client.return_value = client
+        strip = np.zeros((20, 40, 3), dtype=np.uint8)
+
+        result, x_values, y_values = MistralOCRBackend().process_chart_plus_axes(strip, strip, strip)
+
+        self.assertIn("error", result)
+        self.assertEqual((x_values, y_values), ([1.0], []))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,31 @@
+
+import unittest
+
+import cv2
+import numpy as np
+
+from chart2csv.core.preprocess import _parallel_bilateral, preprocess_image
+
+
+class TestParallelBilateral(unittest.TestCase):
+    def test_matches_whole_image_filter(self):
+        rng = np.random.default_rng(0)
+        image = rng.integers(0, 256, (97, 64), dtype=np.uint8)
+
+        expected = cv2.bilateralFilter(image, d=5, sigmaColor=50, sigmaSpace=50)
+        for n_threads in (1, 3, 8):
+            np.testing.assert_array_equal(_parallel_bilateral(image, d=5, n_threads=n_threads), expected)
+
+
+class TestPreprocessImage(unittest.TestCase):
+    def test_downscales_to_max_side(self):
+        image = np.full((3000, 1000, 3), 255, dtype=np.uint8)
+
+        processed = preprocess_image(image, assume_clean_chart=False)
+
+        self.assertEqual(processed.shape, (1200, 400))
+        self.assertEqual(processed.dtype, np.uint8)
+
+
+if __name__ == '__main__':
+    unittest.main()
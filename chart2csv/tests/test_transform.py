@@ -0,0 +1,127 @@
+
+import unittest
+
+import numpy as np
+
+from chart2csv.core.transform import apply_transform, build_transform, compile_transform
+from chart2csv.core.types import Scale, TickArray
+
+
+class TestApplyTransform(unittest.TestCase):
+    def test_linear_and_log_axes(self):
+        transform = {
+            "x": {"a": 0.5, "b": 10.0, "scale": "linear"},
+            "y": {"a": -0.01, "b": 3.0, "scale": "log"},
+        }
+        pixels = np.array([[0, 0], [20, 100], [40, 300]])
+
+        values = apply_transform(pixels, transform)
+
+        self.assertEqual(values.dtype, np.float64)
+        np.testing.assert_allclose(values, [[10.0, 1000.0], [20.0, 100.0], [30.0, 1.0]])
+        # Input is left untouched
+        np.testing.assert_array_equal(pixels, [[0, 0], [20, 100], [40, 300]])
+
+    def test_float32_output(self):
+        transform = {
+            "x": {"a": 0.5, "b": 10.0, "scale": "linear"},
+            "y": {"a": -2.0, "b": 600.0, "scale": "linear"},
+        }
+        pixels = np.array([[0, 0], [20, 100]])
+
+        values = apply_transform(pixels, transform, dtype=np.float32)
+
+        self.assertEqual(values.dtype, np.float32)
+        np.testing.assert_allclose(values, [[10.0, 600.0], [20.0, 400.0]])
+
+        # Log axes keep float64
+        transform["y"] = {"a": -0.01, "b": 3.0, "scale": "log"}
+        self.assertEqual(apply_transform(pixels, transform, dtype=np.float32).dtype, np.float64)
+
+    def test_compiled_transform_is_reusable(self):
+        transform = {
+            "x": {"a": 2.0, "b": 1.0, "scale": "log"},
+            "y": {"a": 1.0, "b": -5.0, "scale": "linear"},
+        }
+        to_values = compile_transform(transform)
+        # Later edits to the dict don't leak into the compiled function
+        transform["x"]["a"] = 0.0
+
+        np.testing.assert_allclose(to_values(np.array([[0, 5], [1, 6]])), [[10.0, 0.0], [1000.0, 1.0]])
+        np.testing.assert_allclose(to_values(np.array([[-0.5, 0]])), [[1.0, -5.0]])
+
+    def test_out_buffer(self):
+        transform = {
+            "x": {"a": 0.5, "b": 10.0, "scale": "linear"},
+            "y": {"a": -0.01, "b": 3.0, "scale": "log"},
+        }
+        out = np.full((2, 2), np.nan)
+
+        values = apply_transform(np.array([[0, 0], [20, 100]]), transform, out=out)
+
+        self.assertIs(values, out)
+        np.testing.assert_allclose(out, [[10.0, 1000.0], [20.0, 100.0]])
+
+    def test_empty(self):
+        transform = {
+            "x": {"a": 1.0, "b": 0.0, "scale": "linear"},
+            "y": {"a": 1.0, "b": 0.0, "scale": "log"},
+        }
+        self.assertEqual(apply_transform(np.empty((0, 2)), transform).shape, (0, 2))
+
+
+class TestBuildTransform(unittest.TestCase):
+    def test_fit_from_ticks(self):
+        ticks = {
+            "x": [{"pixel": 100, "value": 0.0}, {"pixel": 200, "value": 10.0}, {"pixel": 300, "value": 20.0}],
+            "y": [{"pixel": 400, "value": 1.0}, {"pixel": 300, "value": 10.0}, {"pixel": 200, "value": 100.0}],
+        }
+
+        transform, fit_error = build_transform(ticks=ticks, y_scale=Scale.LOG)
+
+        self.assertAlmostEqual(transform["x"]["a"], 0.1)
+        self.assertAlmostEqual(transform["x"]["b"], -10.0)
+        self.assertAlmostEqual(transform["y"]["a"], -0.01)
+        self.assertAlmostEqual(transform["y"]["b"], 4.0)
+        self.assertEqual(transform["y"]["scale"], "log")
+        self.assertAlmostEqual(fit_error, 0.0)
+
+    def test_repeated_ticks_are_memoized(self):
+        ticks = {
+            "x": [{"pixel": 10, "value": 1.0}, {"pixel": 20, "value": 2.0}],
+            "y": [{"pixel": 30, "value": 5.0}, {"pixel": 10, "value": 7.0}],
+        }
+
+        first, _ = build_transform(ticks=ticks)
+        first["x"]["a"] = 123.0
+        second, _ = build_transform(ticks=ticks)
+
+        # Mutating a returned transform does not poison the cache
+        self.assertAlmostEqual(second["x"]["a"], 0.1)
+        self.assertAlmostEqual(second["y"]["a"], -0.1)
+
+    def test_tick_arrays(self):
+        values = np.array([1.0, 10.0, 100.0])
+        ticks = {
+            "x": TickArray(np.array([100, 200, 300]), np.array([0.0, 10.0, 20.0])),
+            "y": TickArray(np.array([400, 300, 200]), values),
+        }
+
+        transform, _ = build_transform(ticks=ticks, y_scale=Scale.LOG)
+
+        self.assertAlmostEqual(transform["x"]["a"], 0.1)
+        self.assertAlmostEqual(transform["y"]["b"], 4.0)
+        # Caller's arrays are not logged in place
+        np.testing.assert_array_equal(values, [1.0, 10.0, 100.0])
+
+    def test_degenerate_pixels(self):
+        ticks = {"x": [{"pixel": 50, "value": 1.0}, {"pixel": 50, "value": 3.0}]}
+
+        transform, _ = build_transform(ticks=ticks)
+
+        self.assertEqual(transform["x"]["a"], 0.0)
+        self.assertEqual(transform["x"]["b"], 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,6 +10,7 @@ matplotlib.use('Agg')  # Non-interactive backend
 import matplotlib.pyplot as plt
 import numpy as np
 import json
+import multiprocessing
 from pathlib import Path
 
 def generate_scatter_simple():
@@ -151,9 +152,14 @@ def main():
     print("Generating synthetic test plots...")
     print()
 
-    generate_scatter_simple()
-    generate_scatter_dense()
-    generate_scatter_sparse()
+    Path('fixtures/synthetic').mkdir(parents=True, exist_ok=True)
+
+    # Each plot seeds its own RNG, so they can be rendered in parallel
+    generators = [generate_scatter_simple, generate_scatter_dense, generate_scatter_sparse]
+    with multiprocessing.Pool(min(len(generators), multiprocessing.cpu_count())) as pool:
+        results = [pool.apply_async(generate) for generate in generators]
+        for result in results:
+            result.get()
 
     print()
     print("✓ All test plots generated successfully!")
@@ -55,6 +55,9 @@ setup(
         "pdf": [
             "pypdfium2>=4.0.0",
         ],
+        "speedups": [
+            "xxhash>=3.0.0",
+        ],
     },
     entry_points={
         "console_scripts": [